@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+WORK_DIR = Path(tempfile.mkdtemp(prefix="wb_bench_"))
+
+os.environ["WB_DATA_DIR"] = str(WORK_DIR / "data")
+os.environ["WB_COOKIES_DIR"] = str(WORK_DIR / "cookies")
+for name, value in {
+    "SITE_URL": "http://127.0.0.1/",
+    "SEARCH_API_URL": "http://127.0.0.1/search",
+    "DETAILS_API_URL": "http://127.0.0.1/details",
+    "SEARCH_QUERY": "benchmark",
+    "DEST": "-1185367",
+    "LIMIT": "100",
+    "START_PAGE": "1",
+    "HEADLESS_MODE": "True",
+    "BROWSER_TIMEOUT": "30000",
+    "REQUEST_TIMEOUT": "20",
+    "IS_FILE_LOG": "False",
+    "IS_CONSOLE_LOG": "True",
+    "LOG_LEVEL": "WARNING",
+    "LOG_ROTATION": "10 MB",
+    "LOG_COMPRESSION": "zip",
+}.items():
+    os.environ.setdefault(name, value)
+
+from benchmarks.stub_server import StubConfig, StubServer  # noqa: E402
+from collectors.data_collector import DataProductCollector  # noqa: E402
+from collectors.id_collector import IdProductCollector  # noqa: E402
+from config.paths import BASKETS_FILE, COOKIES_DIR, COOKIES_FILE, DATA_DIR, PRODUCTS_FILE  # noqa: E402
+from config.settings import settings  # noqa: E402
+from core.client_api import ClientAPI  # noqa: E402
+from utils.checkpoint import Checkpoint  # noqa: E402
+from utils.logger import setup_logger  # noqa: E402
+from utils.report_manager import ReportManager  # noqa: E402
+
+UNLIMITED_RATE = 1_000_000.0
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def wrap(self, name: str | None, func):
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.add(name or kwargs.get("limiter", "search"), time.perf_counter() - started)
+
+        return timed
+
+    def summary(self) -> dict:
+        stages = {}
+        for name, samples in self.samples.items():
+            samples = sorted(samples)
+            stages[name] = {
+                "count": len(samples),
+                "p50_ms": self._percentile(samples, 0.50) * 1000,
+                "p99_ms": self._percentile(samples, 0.99) * 1000,
+            }
+        return stages
+
+    @staticmethod
+    def _percentile(samples: list[float], q: float) -> float:
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def peak_rss_mb() -> dict:
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def configure(server: StubServer, args: argparse.Namespace) -> None:
+    settings.SITE_URL = server.base_url + "/"
+    settings.SEARCH_API_URL = server.base_url + "/search"
+    settings.DETAILS_API_URL = server.base_url + "/details"
+    settings.CARD_DIRECT_HTTP = not args.browser
+    settings.CARD_WORKERS = settings.CARD_WORKERS or settings.BROWSER_PAGES
+    if args.max_pages:
+        settings.SEARCH_MAX_PAGES = args.max_pages
+
+    if not args.keep_limits:
+        settings.SEARCH_RATE = settings.DETAILS_RATE = UNLIMITED_RATE
+        settings.CARD_RATE = settings.CARD_HTTP_RATE = UNLIMITED_RATE
+
+    COOKIES_DIR.mkdir(parents=True, exist_ok=True)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+    with open(COOKIES_FILE, "w", encoding="utf-8") as f:
+        json.dump([{"name": "x_wbaas_token", "value": "benchmark", "domain": "127.0.0.1", "path": "/"}], f)
+
+    with open(BASKETS_FILE, "w", encoding="utf-8") as f:
+        json.dump({server.base_url: [0, 10 ** 6]}, f)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    server = StubServer(StubConfig(
+        total=args.products,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        sizes=args.sizes,
+        padding=args.padding,
+        max_pages=args.max_pages,
+    ))
+    await server.start()
+    configure(server, args)
+
+    recorder = Recorder()
+    checkpoint = Checkpoint.load()
+
+    try:
+        with recorder.phase("total"):
+            async with ClientAPI(True, args.browser) as client:
+                client.request_api.make_request = recorder.wrap(None, client.request_api.make_request)
+                client.get_product_card = recorder.wrap("card_total", client.get_product_card)
+
+                with recorder.phase("ids"):
+                    await IdProductCollector(client, checkpoint).collect_ids()
+
+                data_collector = DataProductCollector(client, checkpoint)
+                data_collector._save_product = recorder.wrap("write", data_collector._save_product)
+
+                with recorder.phase("data"):
+                    await data_collector.collect_data(is_from_file=True)
+
+            with recorder.phase("report"):
+                await ReportManager("benchmark").create_report()
+    finally:
+        await server.stop()
+
+    with open(PRODUCTS_FILE, "rb") as f:
+        products = sum(1 for _ in f)
+
+    return {
+        "products": products,
+        "products_per_sec": products / recorder.phases["data"] if recorder.phases["data"] else 0.0,
+        "phases_sec": recorder.phases,
+        "stages": recorder.summary(),
+        "stub_requests": server.requests,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_results(results: dict) -> None:
+    print(f"Товаров: {results['products']}, {results['products_per_sec']:.1f} товаров/с")
+    print("Фазы: " + ", ".join(f"{name} {sec:.2f}с" for name, sec in results["phases_sec"].items()))
+    print(f"{'Стадия':<11} {'запросов':>9} {'p50, мс':>9} {'p99, мс':>9}")
+    for name, stage in results["stages"].items():
+        print(f"{name:<11} {stage['count']:>9} {stage['p50_ms']:>9.1f} {stage['p99_ms']:>9.1f}")
+    rss = results["peak_rss_mb"]
+    print(f"Пиковый RSS: {rss['self']:.0f} МБ (браузер: {rss['children']:.0f} МБ)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Офлайн-бенчмарк парсера на локальной заглушке API WB")
+    parser.add_argument("--products", type=int, default=1000, help="Товаров в выдаче заглушки")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Средняя задержка ответа")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Разброс задержки")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument("--sizes", type=int, default=5, help="Размеров у товара")
+    parser.add_argument("--padding", type=int, default=200, help="Байт балласта в каждом товаре")
+    parser.add_argument("--max-pages", type=int, default=0, help="Лимит страниц выдачи заглушки (0 — без лимита)")
+    parser.add_argument("--browser", action="store_true", help="Получать карточки через Playwright")
+    parser.add_argument("--keep-limits", action="store_true", help="Не снимать лимиты запросов из настроек")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты в JSON")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--keep-data", action="store_true", help="Не удалять рабочую папку")
+    args = parser.parse_args()
+
+    setup_logger(is_file_log=False, level=args.log_level)
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if args.keep_data:
+            print(f"Рабочая папка: {WORK_DIR}")
+        else:
+            shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from utils import fast_json
+
+
+def make_payload(products: int) -> bytes:
+    rnd = random.Random(0)
+    items = []
+    for index in range(products):
+        items.append({
+            "__sort": index,
+            "ksort": rnd.randint(0, 10_000),
+            "time1": 2,
+            "time2": 48,
+            "wh": rnd.randint(100, 999),
+            "dtype": 4,
+            "dist": rnd.randint(10, 5000),
+            "id": 100_000_000 + index,
+            "root": rnd.randint(1, 10 ** 8),
+            "kindId": 0,
+            "brand": "Бренд",
+            "brandId": rnd.randint(1, 10 ** 6),
+            "siteBrandId": 0,
+            "colors": [{"name": "черный", "id": 0}, {"name": "бежевый", "id": 15132390}],
+            "subjectId": 160,
+            "subjectParentId": 1,
+            "name": f"Пальто из натуральной шерсти {index}",
+            "entity": "пальто",
+            "matchId": rnd.randint(1, 10 ** 6),
+            "supplier": f"Продавец {rnd.randint(1, 500)}",
+            "supplierId": rnd.randint(1, 10 ** 6),
+            "supplierRating": 4.8,
+            "supplierFlags": 0,
+            "pics": rnd.randint(1, 15),
+            "rating": 5,
+            "reviewRating": round(rnd.uniform(3, 5), 1),
+            "nmReviewRating": round(rnd.uniform(3, 5), 1),
+            "feedbacks": rnd.randint(0, 5000),
+            "nmFeedbacks": rnd.randint(0, 5000),
+            "panelPromoId": 0,
+            "volume": 36,
+            "viewFlags": 1312768,
+            "sizes": [
+                {
+                    "name": size,
+                    "origName": size,
+                    "rank": 0,
+                    "optionId": rnd.randint(1, 10 ** 9),
+                    "wh": rnd.randint(100, 999),
+                    "time1": 2,
+                    "time2": 48,
+                    "dtype": 4,
+                    "price": {
+                        "basic": rnd.randint(10_000, 10 ** 7),
+                        "product": rnd.randint(10_000, 10 ** 7),
+                        "logistics": 0,
+                        "return": 0,
+                    },
+                    "saleConditions": 0,
+                    "payload": "x" * 40,
+                }
+                for size in ("42", "44", "46", "48", "50")
+            ],
+            "totalQuantity": rnd.randint(0, 1000),
+            "logs": "y" * 120,
+            "meta": {"tokens": [], "presetId": 0},
+        })
+    return json.dumps({"metadata": {"name": "поиск"}, "total": products, "products": items}).encode()
+
+
+def measure(name: str, decode, body: bytes, repeat: int) -> None:
+    decode(body)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        decode(body)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    data = decode(body)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+
+    print(f"{name:<32} {elapsed * 1000:8.2f} мс {retained / 1024 / 1024:8.2f} МБ")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сравнение способов декодирования ответов поиска")
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    body = make_payload(args.products)
+    print(f"Ответ: {len(body) / 1024:.0f} КБ, {args.products} товаров, {args.repeat} повторов")
+
+    measure("text() + json.loads", lambda b: json.loads(b.decode("utf-8")), body, args.repeat)
+
+    if fast_json._loads is not None:
+        measure("orjson", fast_json._loads, body, args.repeat)
+    else:
+        print("orjson не установлен: uv sync --extra fast")
+
+
+if __name__ == "__main__":
+    main()
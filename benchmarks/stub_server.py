@@ -0,0 +1,163 @@
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+FIRST_PRODUCT_ID = 100_000_000
+
+
+class StubConfig:
+    def __init__(
+        self,
+        total: int = 1000,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 10.0,
+        rate_429: float = 0.0,
+        sizes: int = 5,
+        padding: int = 200,
+        options: int = 20,
+        max_pages: int = 0,
+        seed: int = 0,
+    ):
+        self.total = total
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.sizes = sizes
+        self.padding = padding
+        self.options = options
+        self.max_pages = max_pages
+        self.seed = seed
+
+
+class StubServer:
+    def __init__(self, config: StubConfig, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.random = random.Random(config.seed)
+        self.requests: dict[str, int] = {}
+        self._runner = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/search", self._search)
+        app.router.add_get("/details", self._details)
+        app.router.add_get("/vol{vol}/part{part}/{product_id}/info/ru/card.json", self._card)
+        app.router.add_get("/catalog/{product_id}/detail.aspx", self._product_page)
+        app.router.add_get("/", self._main_page)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _search(self, request: web.Request) -> web.Response:
+        await self._delay("search")
+        if self._is_throttled():
+            return web.Response(status=429)
+
+        page = int(request.query.get("page", 1))
+        limit = int(request.query.get("limit", 100))
+        ids = range(FIRST_PRODUCT_ID, FIRST_PRODUCT_ID + self.config.total)
+
+        if "priceU" in request.query:
+            low, high = (int(value) for value in request.query["priceU"].split(";"))
+            ids = [product_id for product_id in ids if low <= self._price(product_id) <= high]
+
+        if self.config.max_pages and page > self.config.max_pages:
+            return self._json({"total": len(ids), "products": []})
+
+        start = (page - 1) * limit
+        page_ids = ids[start:start + limit]
+        return self._json({"total": len(ids), "products": [self._product(i) for i in page_ids]})
+
+    async def _details(self, request: web.Request) -> web.Response:
+        await self._delay("details")
+        if self._is_throttled():
+            return web.Response(status=429)
+
+        ids = [int(i) for i in request.query.get("nm", "").split(";") if i]
+        return self._json({"products": [self._product(i) for i in ids]})
+
+    async def _card(self, request: web.Request) -> web.Response:
+        await self._delay("card")
+        if self._is_throttled():
+            return web.Response(status=429)
+
+        product_id = int(request.match_info["product_id"])
+        return self._json({
+            "nm_id": product_id,
+            "imt_name": f"Товар {product_id}",
+            "description": "Описание товара. " * (self.config.padding // 16 + 1),
+            "media": {"photo_count": product_id % 10 + 1, "has_video": False},
+            "options": [
+                {"name": f"Характеристика {index}", "value": f"Значение {product_id % (index + 2)}"}
+                for index in range(self.config.options)
+            ]
+            + [{"name": "Страна производства", "value": "Россия" if product_id % 3 else "Китай"}],
+            "grouped_options": [],
+        })
+
+    async def _product_page(self, request: web.Request) -> web.Response:
+        await self._delay("page")
+        product_id = int(request.match_info["product_id"])
+        card_url = f"/vol{product_id // 100000}/part{product_id // 1000}/{product_id}/info/ru/card.json"
+        return web.Response(
+            text=f"<html><body><script>fetch({json.dumps(card_url)})</script></body></html>",
+            content_type="text/html",
+        )
+
+    async def _main_page(self, request: web.Request) -> web.Response:
+        return web.Response(text='<html><body class="main-page"></body></html>', content_type="text/html")
+
+    def _product(self, product_id: int) -> dict:
+        rnd = random.Random(product_id)
+        return {
+            "id": product_id,
+            "name": f"Товар {product_id}",
+            "brand": "Бренд",
+            "supplier": f"Продавец {product_id % 50}",
+            "supplierId": product_id % 50 + 1,
+            "pics": product_id % 10 + 1,
+            "reviewRating": round(rnd.uniform(3, 5), 1),
+            "feedbacks": rnd.randint(0, 5000),
+            "totalQuantity": rnd.randint(0, 1000),
+            "sizes": [
+                {
+                    "name": str(42 + index * 2),
+                    "optionId": rnd.randint(1, 10 ** 9),
+                    "price": {"basic": 2_500_000, "product": self._price(product_id)},
+                    "stocks": [{"wh": 507, "qty": rnd.randint(0, 50)}],
+                }
+                for index in range(self.config.sizes)
+            ],
+            "logs": "x" * self.config.padding,
+        }
+
+    @staticmethod
+    def _price(product_id: int) -> int:
+        return product_id * 7919 % 2_000_000 + 10_000
+
+    async def _delay(self, endpoint: str) -> None:
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        delay = self.config.latency_ms + self.random.uniform(-1, 1) * self.config.jitter_ms
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _is_throttled(self) -> bool:
+        return self.random.random() < self.config.rate_429
+
+    @staticmethod
+    def _json(data: dict) -> web.Response:
+        return web.Response(body=json.dumps(data, ensure_ascii=False).encode(), content_type="application/json")
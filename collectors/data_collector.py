@@ -1,55 +1,148 @@
+import asyncio
 import json
-from typing import AsyncGenerator, Any
+import os
+import time
+from contextlib import AsyncExitStack, suppress
+from typing import AsyncGenerator, AsyncIterable
 
-import aiofiles
-
-from config.paths import PRODUCTS_FILE, DATA_DIR, PRODUCTS_ID_FILE
+from config.paths import PRODUCTS_FILE, DATA_DIR
 from config.settings import settings
 from core.client_api import ClientAPI
+from core.price_splitter import PriceSplitter
+from core.search_paginator import SearchPaginator
 from loguru import logger
+from collectors.pipeline import Emit, Pipeline, Stage
+from utils.checkpoint import Checkpoint
+from utils.concurrency import chunked
+from utils.id_store import IdStore
+from utils.jsonl_writer import JsonlWriter
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.sqlite_store import SqliteWriter
+from utils.task_queue import TaskQueue, create_task_queue
 
 
 class DataProductCollector:
-    def __init__(self, client: ClientAPI):
+    use_card_cache = True
+    products_file = PRODUCTS_FILE
+
+    def __init__(self, client: ClientAPI, checkpoint: Checkpoint | None = None):
         self.client = client
-        self._create_products_data_file()
+        self.checkpoint = checkpoint or Checkpoint.load()
+        self._parsed = 0
+        self._skipped = 0
+
+        if self.checkpoint.resumed:
+            self.completed = self._recover_products_file()
+        else:
+            self.completed = set()
+            self._create_products_data_file()
+
+        self.writers = [JsonlWriter(self.products_file)]
+        if settings.SQLITE_STORE:
+            self.writers.append(SqliteWriter())
+
+        self.task_queue: TaskQueue | None = None
+        self._leased: set[int] = set()
+        self._acked = asyncio.Event()
 
     async def collect_data(self, is_from_file: bool = False) -> None:
         if is_from_file:
-            async for id in self._products_ids_generator():
-                product = await self.parse_product(id)
-                if not product:
-                    continue
-                await self._save_product(product)
+            self.task_queue = create_task_queue()
+
+        if self.task_queue:
+            self.writers[0].on_flush = self._ack_written
+            source = self._queue_ids_generator()
+        elif is_from_file:
+            source = chunked(self._products_ids_generator(), settings.DETAILS_BATCH_SIZE)
         else:
-            async for product in self.parse_products():
-                await self._save_product(product)
+            source = self._products_generator()
 
-    async def parse_products(self) -> AsyncGenerator[dict]:
-        async for product, index in self._products_generator():
-            logger.info(f"📍 {index}: парсинг {product.get('id')}")
+        await self._run_pipeline(source)
 
-            card = await self.client.get_product_card(product.get("id"))
+    async def _run_pipeline(self, source: AsyncIterable) -> None:
+        pipeline = Pipeline(
+            [
+                Stage("details", self._details_stage, settings.DETAILS_CONCURRENCY),
+                Stage("card", self._card_stage, settings.CARD_WORKERS or self.client.card_concurrency),
+                Stage("writer", self._writer_stage),
+            ],
+            settings.PIPELINE_QUEUE_SIZE,
+        )
+        try:
+            async with AsyncExitStack() as stack:
+                if self.task_queue:
+                    await stack.enter_async_context(self.task_queue)
+                    heartbeat = asyncio.create_task(self._extend_leases())
+                    stack.push_async_callback(self._stop_task, heartbeat)
+                for writer in self.writers:
+                    await stack.enter_async_context(writer)
+                await pipeline.run(source)
+        finally:
+            self.checkpoint.save()
 
-            if not card:
-                continue
+        if self._skipped:
+            logger.info(f"Пропущено уже обработанных товаров: {self._skipped}")
 
-            details = self._parse_details(product)
-            info = self._get_info(card)
-            images = self._parse_images(card)
+    async def _details_stage(self, batch: list[int | dict], emit: Emit) -> None:
+        ids = [
+            item
+            for item in batch
+            if not isinstance(item, dict) and self._is_pending(item, count=False)
+        ]
+        started = time.time()
+        with metrics.timer("stage.details"):
+            details = await self.client.get_products(ids) if ids else {}
+        ended = time.time()
 
-            yield details | info | images
+        skipped = []
+        for item in batch:
+            if isinstance(item, dict):
+                product_id, product = item.get("id"), item
+            else:
+                product_id, product = item, details.get(item)
 
-    async def parse_product(self, product_id: int) -> dict | None:
-        logger.info(f"📍 Единичный парсинг {product_id}")
+            if self._is_pending(product_id):
+                tracer.record(product_id, "details", started, ended)
+                await emit((product_id, product))
+            else:
+                skipped.append(product_id)
 
-        product = await self.client.get_product(product_id)
-        card = await self.client.get_product_card(product_id)
+        await self._ack(skipped)
+
+    async def _card_stage(self, item: tuple[int, dict | None], emit: Emit) -> None:
+        product_id, product = item
+        self._parsed += 1
+        logger.info(f"📍 {self._parsed}: парсинг {product_id}")
+
+        with metrics.timer("stage.card"), tracer.span(product_id, "card"):
+            card = await self.client.get_product_card(product_id, self.use_card_cache)
 
         if not card:
             logger.warning(f"⚠️ Не удалось получить спарсить {product_id}")
-            return None
+            metrics.inc("products.failed")
+            tracer.finish(product_id, "failed")
+            self.checkpoint.mark_failed(product_id)
+            await self._nack([product_id])
+            return
+
+        await emit(self._build_product(product or {"id": product_id}, card))
+
+    async def _writer_stage(self, product: dict, emit: Emit) -> None:
+        with tracer.span(product["product_id"], "writer"):
+            await self._save_product(product)
+        tracer.finish(product["product_id"])
+        self.checkpoint.mark_done(product["product_id"])
+
+    def _is_pending(self, product_id: int, count: bool = True) -> bool:
+        if product_id not in self.completed and self.checkpoint.can_retry(product_id):
+            return True
 
+        if count:
+            self._skipped += 1
+        return False
+
+    def _build_product(self, product: dict, card: dict) -> dict:
         details = self._parse_details(product)
         info = self._get_info(card)
         images = self._parse_images(card)
@@ -113,19 +206,21 @@ class DataProductCollector:
             return {"images": images}
         return {"images": []}
 
-    async def _products_generator(self) -> AsyncGenerator[tuple[Any, int], Any]:
+    async def _products_generator(self) -> AsyncGenerator[list[dict]]:
         logger.info("📊 Начало получения списка товаров")
 
         total = 0
-        page = settings.START_PAGE
-        while True:
-            products_list = await self.client.get_products_list(page)
-            if not products_list:
-                break
-            for product in products_list:
-                total += 1
-                yield product, total
-            page += 1
+        if settings.SEARCH_SPLIT_BY_PRICE:
+            seen: set[int] = set()
+            async for _, _, products_list in PriceSplitter(self.client).pages():
+                products_list = [product for product in products_list if product.get("id") not in seen]
+                seen.update(product.get("id") for product in products_list)
+                total += len(products_list)
+                yield products_list
+        else:
+            async for _, products_list in SearchPaginator(self.client).pages():
+                total += len(products_list)
+                yield products_list
 
         if not total:
             logger.error("❌ ID товаров не найдены. Работа программы остановлена")
@@ -135,23 +230,115 @@ class DataProductCollector:
 
     @staticmethod
     async def _products_ids_generator() -> AsyncGenerator[int]:
-        async with aiofiles.open(PRODUCTS_ID_FILE, "r") as f:
-            content = await f.read()
-            ids = json.loads(content)
+        id_store = IdStore()
 
-        logger.info(f"Из файла загружено {len(ids)} ID товаров")
+        logger.info(f"Из файла загружено {len(id_store)} ID товаров")
 
-        for id in ids:
+        for id in id_store.iter_ids():
             logger.debug(id)
             yield id
 
-    @staticmethod
-    async def _save_product(data: dict) -> None:
-        async with aiofiles.open(PRODUCTS_FILE, "a", encoding="utf-8") as f:
-            await f.write(json.dumps(data, ensure_ascii=False) + "\n")
+    async def _queue_ids_generator(self) -> AsyncGenerator[list[int]]:
+        logger.info(f"Получение ID товаров из очереди {self.task_queue.name}")
+
+        card_workers = settings.CARD_WORKERS or self.client.card_concurrency
+        prefetch = max(settings.DETAILS_BATCH_SIZE, card_workers * settings.QUEUE_PREFETCH_PER_WORKER)
+
+        while True:
+            while len(self._leased) >= prefetch:
+                self._acked.clear()
+                await self._acked.wait()
+
+            ids = await self.task_queue.lease(settings.DETAILS_BATCH_SIZE)
+            if ids:
+                self._leased.update(ids)
+                yield ids
+                continue
+
+            stats = await self.task_queue.stats()
+            if not stats["pending"] and stats["leased"] <= len(self._leased):
+                logger.info(f"✅ Очередь задач пуста: {stats}")
+                return
+
+            await asyncio.sleep(settings.QUEUE_IDLE_WAIT)
+
+    async def _extend_leases(self) -> None:
+        while True:
+            await asyncio.sleep(settings.QUEUE_VISIBILITY_TIMEOUT / 3)
+            if self._leased:
+                await self.task_queue.extend(list(self._leased))
 
     @staticmethod
-    def _create_products_data_file() -> None:
+    async def _stop_task(task: asyncio.Task) -> None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _ack_written(self, records: list[dict]) -> None:
+        await self._ack([record["product_id"] for record in records])
+
+    async def _ack(self, ids: list[int]) -> None:
+        if self.task_queue and ids:
+            await self.task_queue.ack(ids)
+            self._leased.difference_update(ids)
+            self._acked.set()
+
+    async def _nack(self, ids: list[int]) -> None:
+        if self.task_queue and ids:
+            await self.task_queue.nack(ids)
+            self._leased.difference_update(ids)
+            self._acked.set()
+
+    async def _save_product(self, data: dict) -> None:
+        with metrics.timer("writer.save"):
+            for writer in self.writers:
+                await writer.write(data)
+        metrics.inc("products.written")
+
+    def _recover_products_file(self) -> set[int]:
+        completed = set()
+        if not self.products_file.exists():
+            return completed
+
+        corrupted = 0
+        valid_size = 0
+        with open(self.products_file, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    completed.add(json.loads(line)["product_id"])
+                except (json.JSONDecodeError, KeyError):
+                    corrupted += 1
+                    continue
+                valid_size += len(line)
+
+        if corrupted:
+            logger.warning(f"⚠️ В {self.products_file.name} пропущено поврежденных строк: {corrupted}")
+            self._rewrite_valid_lines()
+        else:
+            with open(self.products_file, "rb+") as f:
+                f.truncate(valid_size)
+
+        logger.info(f"В {self.products_file.name} найдено {len(completed)} готовых товаров")
+        return completed
+
+    def _rewrite_valid_lines(self) -> None:
+        tmp_path = self.products_file.with_suffix(".jsonl.tmp")
+        with open(self.products_file, "rb") as src, open(tmp_path, "wb") as dst:
+            for line in src:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)["product_id"]
+                except (json.JSONDecodeError, KeyError):
+                    continue
+                dst.write(line)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.products_file)
+
+    def _create_products_data_file(self) -> None:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(PRODUCTS_FILE, "w", encoding="utf-8"):
+        with open(self.products_file, "w", encoding="utf-8"):
             pass
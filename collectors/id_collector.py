@@ -1,63 +1,92 @@
-import json
+from contextlib import AsyncExitStack
+from itertools import batched
+from typing import AsyncGenerator
 
 from config.settings import settings
 from core.client_api import ClientAPI
-from config.paths import DATA_DIR, PRODUCTS_ID_FILE
+from core.price_splitter import PriceSplitter
+from core.search_paginator import SearchPaginator
+from utils.checkpoint import Checkpoint
 from utils.exceptions import ProductsIDsNotFoundError
+from utils.id_store import IdStore
+from utils.task_queue import create_task_queue
 from loguru import logger
 
 
 class IdProductCollector:
-    def __init__(self, client: ClientAPI):
+    def __init__(self, client: ClientAPI, checkpoint: Checkpoint | None = None):
         self.client = client
-        self._create_products_id_file()
+        self.checkpoint = checkpoint or Checkpoint.load()
+        self.id_store = IdStore()
+        if not self.checkpoint.resumed:
+            self.id_store.reset()
+        self.task_queue = create_task_queue()
 
     async def collect_ids(self) -> None:
-        await self._get_ids()
+        async with AsyncExitStack() as stack:
+            if self.task_queue:
+                await stack.enter_async_context(self.task_queue)
 
-    async def _get_ids(self) -> bool | None:
-        logger.info("📊 Начало получения списка ID товаров")
-
-        products_ids_len = 0
-        current_page = settings.START_PAGE
+            if self.checkpoint.ids_done:
+                logger.info(f"ID товаров уже собраны ({len(self.id_store)}), сбор пропущен")
+                await self._enqueue_stored_ids()
+                return
 
-        while True:
-            products_list = await self.client.get_products_list(current_page)
+            await self._get_ids()
 
-            if not products_list:
-                break
+    async def _get_ids(self) -> bool | None:
+        logger.info("📊 Начало получения списка ID товаров")
 
-            temp_ids_list = [product.get("id", "x000x") for product in products_list]
+        try:
+            with self.id_store:
+                async for page, products_list in self._search_pages():
+                    temp_ids_list = [product.get("id") for product in products_list]
 
-            self._save_ids(temp_ids_list)
-            products_ids_len += len(temp_ids_list)
+                    self._save_ids(temp_ids_list)
+                    await self._enqueue_ids(temp_ids_list)
+                    if not settings.SEARCH_SPLIT_BY_PRICE:
+                        self.checkpoint.mark_page(page)
+        finally:
+            self.checkpoint.save()
 
-            current_page += 1
+        products_ids_len = len(self.id_store)
 
         if products_ids_len:
             logger.info(
                 f"✅ Список ID товаров успешно получен. Всего товаров: {products_ids_len}"
             )
+            self.checkpoint.mark_ids_done()
             return True
         else:
             raise ProductsIDsNotFoundError()
 
-    @staticmethod
-    def _save_ids(new_data: list) -> None:
-        with open(PRODUCTS_ID_FILE, "r+", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = []
-
-            data.extend(new_data)
-
-            f.seek(0)
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.truncate()
-
-    @staticmethod
-    def _create_products_id_file() -> None:
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(PRODUCTS_ID_FILE, "w", encoding="utf-8"):
-            pass
+    async def _search_pages(self) -> AsyncGenerator[tuple[int, list[dict]]]:
+        if settings.SEARCH_SPLIT_BY_PRICE:
+            async for _, page, products_list in PriceSplitter(self.client).pages():
+                yield page, products_list
+            return
+
+        start_page = settings.START_PAGE
+        if self.checkpoint.last_page:
+            start_page = self.checkpoint.last_page + 1
+            logger.info(f"Продолжение сбора ID со страницы {start_page}")
+
+        async for page, products_list in SearchPaginator(self.client).pages(start_page):
+            yield page, products_list
+
+    def _save_ids(self, new_data: list) -> int:
+        return self.id_store.add(new_data)
+
+    async def _enqueue_ids(self, ids: list) -> int:
+        if not self.task_queue:
+            return 0
+        return await self.task_queue.enqueue([product_id for product_id in ids if isinstance(product_id, int)])
+
+    async def _enqueue_stored_ids(self) -> None:
+        if not self.task_queue:
+            return
+
+        added = 0
+        for chunk in batched(self.id_store.iter_ids(), 10_000):
+            added += await self._enqueue_ids(list(chunk))
+        logger.info(f"В очередь {self.task_queue.name} добавлено {added} ID товаров")
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, AsyncIterable, Awaitable, Callable
+
+from loguru import logger
+
+Emit = Callable[[Any], Awaitable[None]]
+Handler = Callable[[Any, Emit], Awaitable[None]]
+
+_DONE = object()
+
+
+class Stage:
+    def __init__(self, name: str, handler: Handler, workers: int = 1):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    def __init__(self, stages: list[Stage], queue_size: int):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, source: AsyncIterable) -> None:
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._produce(source, queues[0], self.stages[0].workers))
+
+                for index, stage in enumerate(self.stages):
+                    is_last = index + 1 == len(self.stages)
+                    out_queue = None if is_last else queues[index + 1]
+                    next_workers = 0 if is_last else self.stages[index + 1].workers
+
+                    workers = [
+                        tg.create_task(self._work(stage, queues[index], out_queue))
+                        for _ in range(stage.workers)
+                    ]
+                    tg.create_task(self._finish(stage, workers, out_queue, next_workers))
+        except BaseExceptionGroup as group:
+            raise self._first_error(group) from group
+
+    @staticmethod
+    def _first_error(group: BaseExceptionGroup) -> BaseException:
+        error = group.exceptions[0]
+        while isinstance(error, BaseExceptionGroup):
+            error = error.exceptions[0]
+        return error
+
+    @staticmethod
+    async def _produce(source: AsyncIterable, queue: asyncio.Queue, workers: int) -> None:
+        async for item in source:
+            await queue.put(item)
+
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    @staticmethod
+    async def _work(stage: Stage, in_queue: asyncio.Queue, out_queue: asyncio.Queue | None) -> None:
+        async def emit(item: Any) -> None:
+            if out_queue is not None:
+                await out_queue.put(item)
+
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                return
+            await stage.handler(item, emit)
+
+    @staticmethod
+    async def _finish(
+        stage: Stage, workers: list[asyncio.Task], out_queue: asyncio.Queue | None, next_workers: int
+    ) -> None:
+        await asyncio.gather(*workers)
+        logger.debug(f"Стадия {stage.name} завершена")
+
+        for _ in range(next_workers):
+            await out_queue.put(_DONE)
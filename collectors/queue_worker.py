@@ -0,0 +1,58 @@
+import json
+import os
+import socket
+
+from loguru import logger
+
+from collectors.data_collector import DataProductCollector
+from config.paths import PRODUCTS_FILE, WORKERS_DIR
+from config.settings import settings
+from core.client_api import ClientAPI
+from utils.checkpoint import Checkpoint
+
+
+class QueueWorkerCollector(DataProductCollector):
+    def __init__(self, client: ClientAPI):
+        self.worker_id = settings.QUEUE_WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+        self.products_file = WORKERS_DIR / f"{self.worker_id}.jsonl"
+
+        WORKERS_DIR.mkdir(parents=True, exist_ok=True)
+        checkpoint = Checkpoint.load(True, WORKERS_DIR / f"{self.worker_id}.checkpoint.json")
+        super().__init__(client, checkpoint)
+
+    async def collect_data(self, is_from_file: bool = True) -> None:
+        logger.info(f"📍 Воркер очереди {self.worker_id}: результаты в {self.products_file.name}")
+        await super().collect_data(is_from_file=True)
+
+        async with self.task_queue:
+            stats = await self.task_queue.stats()
+
+        if stats["pending"] or stats["leased"]:
+            logger.info(f"Очередь еще обрабатывается другими воркерами: {stats}")
+            return
+
+        self._merge_workers()
+
+    def _create_products_data_file(self) -> None:
+        with open(self.products_file, "a", encoding="utf-8"):
+            pass
+
+    def _merge_workers(self) -> None:
+        tmp_path = PRODUCTS_FILE.with_suffix(f".{self.worker_id}.tmp")
+        seen: set[int] = set()
+
+        with open(tmp_path, "w", encoding="utf-8") as dst:
+            for path in sorted(WORKERS_DIR.glob("*.jsonl")):
+                with open(path, "r", encoding="utf-8") as src:
+                    for line in src:
+                        try:
+                            product_id = json.loads(line)["product_id"]
+                        except (json.JSONDecodeError, KeyError):
+                            continue
+
+                        if product_id not in seen:
+                            seen.add(product_id)
+                            dst.write(line)
+
+        os.replace(tmp_path, PRODUCTS_FILE)
+        logger.info(f"✅ Результаты воркеров объединены в {PRODUCTS_FILE.name}: {len(seen)} товаров")
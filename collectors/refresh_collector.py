@@ -0,0 +1,119 @@
+import json
+import os
+from typing import AsyncGenerator
+
+from loguru import logger
+
+from collectors.data_collector import DataProductCollector
+from collectors.pipeline import Emit
+from config.paths import PRODUCTS_FILE, PREVIOUS_PRODUCTS_FILE, REFRESHED_PRODUCTS_FILE
+from config.settings import settings
+from core.client_api import ClientAPI
+from utils.checkpoint import Checkpoint
+from utils.concurrency import chunked
+from utils.exceptions import ProductsFileNotFoundError
+from utils.id_store import IdStore
+
+
+class ProductsSnapshot:
+    def __init__(self):
+        self.offsets: dict[int, int] = {}
+        self._file = None
+
+    @classmethod
+    def take(cls) -> "ProductsSnapshot":
+        if not (PRODUCTS_FILE.exists() and PRODUCTS_FILE.stat().st_size > 0):
+            raise ProductsFileNotFoundError()
+
+        snapshot = cls()
+        snapshot._file = open(PRODUCTS_FILE, "rb")
+
+        offset = 0
+        for line in snapshot._file:
+            try:
+                snapshot.offsets[json.loads(line)["product_id"]] = offset
+            except (json.JSONDecodeError, KeyError):
+                pass
+            offset += len(line)
+
+        logger.info(f"В кэше {len(snapshot.offsets)} товаров из прошлого сбора")
+        return snapshot
+
+    def get(self, product_id: int) -> dict | None:
+        offset = self.offsets.get(product_id)
+        if offset is None:
+            return None
+
+        self._file.seek(offset)
+        return json.loads(self._file.readline())
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class RefreshProductCollector(DataProductCollector):
+    use_card_cache = False
+    products_file = REFRESHED_PRODUCTS_FILE
+
+    def __init__(self, client: ClientAPI, checkpoint: Checkpoint | None = None):
+        self.snapshot = ProductsSnapshot.take()
+        super().__init__(client, checkpoint or Checkpoint(path=None))
+        self._reused = 0
+
+    async def refresh_data(self) -> None:
+        logger.info("📊 Обновление цен и остатков по известным товарам")
+
+        try:
+            await self._run_pipeline(
+                chunked(self._refresh_ids_generator(), settings.DETAILS_BATCH_SIZE)
+            )
+        finally:
+            self.snapshot.close()
+
+        os.replace(PRODUCTS_FILE, PREVIOUS_PRODUCTS_FILE)
+        os.replace(REFRESHED_PRODUCTS_FILE, PRODUCTS_FILE)
+
+        logger.info(
+            f"✅ Обновление завершено. Карточки из кэша: {self._reused}, "
+            f"запрошено заново: {self._parsed}"
+        )
+
+    async def _card_stage(self, item: tuple[int, dict | None], emit: Emit) -> None:
+        product_id, product = item
+        cached = self.snapshot.get(product_id)
+
+        if cached and not product:
+            logger.warning(f"⚠️ Нет свежих данных для {product_id}, оставлены прежние")
+            self._reused += 1
+            await emit(cached)
+            return
+
+        if cached and not self._has_changed(product, cached):
+            self._reused += 1
+            await emit(cached | self._parse_details(product))
+            return
+
+        await super()._card_stage(item, emit)
+
+    @staticmethod
+    def _has_changed(product: dict, cached: dict) -> bool:
+        photo_count = product.get("pics")
+        return photo_count is not None and photo_count != len(cached.get("images") or [])
+
+    async def _refresh_ids_generator(self) -> AsyncGenerator[int]:
+        for product_id in self.snapshot.offsets:
+            yield product_id
+
+        id_store = IdStore()
+        if not id_store.path.exists():
+            return
+
+        new_ids = 0
+        for product_id in id_store.iter_ids():
+            if product_id not in self.snapshot.offsets:
+                new_ids += 1
+                yield product_id
+
+        logger.info(f"Новых товаров из {id_store.path.name}: {new_ids}")
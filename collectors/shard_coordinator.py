@@ -0,0 +1,200 @@
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import sys
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+from loguru import logger
+
+from config.paths import BASE_DIR, COOKIES_FILE, PRODUCTS_FILE, SHARDS_DIR
+from config.settings import settings
+from utils.exceptions import CookiesFileNotFoundError, ShardsFailedError
+from utils.id_store import IdStore
+from utils.jsonl_writer import JsonlWriter
+from utils.sqlite_store import SqliteWriter
+
+
+class Shard:
+    def __init__(self, name: str, args: list[str], env: dict[str, str] | None = None):
+        self.name = name
+        self.args = args
+        self.env = env or {}
+        self.dir = SHARDS_DIR / name
+        self.attempts = 0
+        self.returncode: int | None = None
+        self._counted_offset = 0
+        self.products = 0
+
+    @property
+    def products_file(self) -> Path:
+        return self.dir / "data" / "products.jsonl"
+
+    def prepare(self) -> None:
+        (self.dir / "data").mkdir(parents=True, exist_ok=True)
+        cookies_dir = self.dir / "cookies"
+        cookies_dir.mkdir(parents=True, exist_ok=True)
+        if not (cookies_dir / COOKIES_FILE.name).exists():
+            shutil.copy(COOKIES_FILE, cookies_dir / COOKIES_FILE.name)
+
+    def count_products(self) -> int:
+        if not self.products_file.exists():
+            return self.products
+
+        with open(self.products_file, "rb") as f:
+            f.seek(self._counted_offset)
+            chunk = f.read()
+        self.products += chunk.count(b"\n")
+        self._counted_offset += len(chunk)
+        return self.products
+
+
+class ShardCoordinator:
+    def __init__(self, shards: list[Shard], workers: int = settings.SHARD_WORKERS):
+        self.shards = shards
+        self.workers = max(1, workers)
+        self._done = 0
+
+    @classmethod
+    def from_queries(cls, queries: list[str], dests: list[str]) -> "ShardCoordinator":
+        shards = [
+            Shard(f"q{index:03d}", ["--mode", "full"], {"SEARCH_QUERY": query, "DEST": dest})
+            for index, (query, dest) in enumerate(itertools.product(queries, dests))
+        ]
+        return cls(shards)
+
+    @classmethod
+    def from_ids(cls, count: int) -> "ShardCoordinator":
+        shards = [Shard(f"ids{index:03d}", ["--mode", "data", "--from-file"]) for index in range(count)]
+        stores = [IdStore(shard.dir / "data" / "products_ids.bin") for shard in shards]
+
+        for shard, store in zip(shards, stores):
+            shard.prepare()
+            store.reset()
+            store.open()
+
+        try:
+            for batch in itertools.batched(IdStore().iter_ids(), settings.DETAILS_BATCH_SIZE * count):
+                for index, store in enumerate(stores):
+                    store.add(batch[index::count])
+        finally:
+            for store in stores:
+                store.close()
+
+        logger.info(f"ID товаров разбиты на {count} шардов: {', '.join(str(len(s)) for s in stores)}")
+        return cls(shards)
+
+    async def run(self) -> None:
+        if not COOKIES_FILE.exists():
+            raise CookiesFileNotFoundError()
+
+        logger.info(f"📊 Запуск {len(self.shards)} шардов в {self.workers} процессах")
+
+        semaphore = asyncio.Semaphore(self.workers)
+        progress = asyncio.create_task(self._report_progress())
+        try:
+            await asyncio.gather(*(self._run_shard(shard, semaphore) for shard in self.shards))
+        finally:
+            progress.cancel()
+
+        self._log_progress()
+
+        failed = [shard.name for shard in self.shards if shard.returncode != 0]
+        await self.merge()
+
+        if failed:
+            logger.error(f"❌ Не выполнены шарды: {', '.join(failed)}")
+            raise ShardsFailedError()
+
+    async def merge(self) -> None:
+        logger.info(f"Объединение результатов шардов в {PRODUCTS_FILE.name}")
+
+        with open(PRODUCTS_FILE, "w", encoding="utf-8"):
+            pass
+
+        writers = [JsonlWriter(PRODUCTS_FILE)]
+        if settings.SQLITE_STORE:
+            writers.append(SqliteWriter())
+
+        seen: set[tuple[int, str | None]] = set()
+        duplicates = 0
+        async with AsyncExitStack() as stack:
+            for writer in writers:
+                await stack.enter_async_context(writer)
+
+            for shard in self.shards:
+                if not shard.products_file.exists():
+                    continue
+
+                dest = shard.env.get("DEST")
+
+                with open(shard.products_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            product = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+
+                        key = (product["product_id"], dest)
+                        if key in seen:
+                            duplicates += 1
+                            continue
+                        seen.add(key)
+
+                        if dest is not None:
+                            product["dest"] = dest
+
+                        for writer in writers:
+                            await writer.write(product)
+
+        logger.info(f"✅ Объединено {len(seen)} товаров, дубликатов отброшено: {duplicates}")
+
+    async def _run_shard(self, shard: Shard, semaphore: asyncio.Semaphore) -> None:
+        shard.prepare()
+
+        while shard.attempts <= settings.SHARD_RETRIES:
+            args = shard.args + (["--resume"] if shard.attempts else [])
+            shard.attempts += 1
+
+            async with semaphore:
+                logger.info(f"📍 Шард {shard.name}: запуск (попытка {shard.attempts}) {' '.join(args)}")
+                shard.returncode = await self._spawn(shard, args)
+
+            if shard.returncode == 0:
+                self._done += 1
+                logger.info(f"✅ Шард {shard.name} завершен: {shard.count_products()} товаров")
+                return
+
+            logger.warning(f"⚠️ Шард {shard.name} завершился с кодом {shard.returncode}")
+
+        logger.error(f"❌ Шард {shard.name} не выполнен за {shard.attempts} попыток, см. {shard.dir / 'worker.log'}")
+
+    @staticmethod
+    async def _spawn(shard: Shard, args: list[str]) -> int:
+        env = os.environ | shard.env | {
+            "WB_DATA_DIR": str(shard.dir / "data"),
+            "WB_COOKIES_DIR": str(shard.dir / "cookies"),
+        }
+
+        with open(shard.dir / "worker.log", "ab") as log:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "main", *args,
+                cwd=BASE_DIR, env=env, stdout=log, stderr=asyncio.subprocess.STDOUT,
+            )
+            try:
+                return await process.wait()
+            except asyncio.CancelledError:
+                process.terminate()
+                await process.wait()
+                raise
+
+    async def _report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SHARD_PROGRESS_INTERVAL)
+            self._log_progress()
+
+    def _log_progress(self) -> None:
+        products = sum(shard.count_products() for shard in self.shards)
+        logger.info(f"📊 Шарды: {self._done}/{len(self.shards)} готово, собрано товаров: {products}")
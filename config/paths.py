@@ -1,14 +1,28 @@
+import os
 from pathlib import Path
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-COOKIES_DIR = BASE_DIR / "cookies"
+COOKIES_DIR = Path(os.getenv("WB_COOKIES_DIR", BASE_DIR / "cookies"))
 COOKIES_FILE = COOKIES_DIR / "cookies.json"
 
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.getenv("WB_DATA_DIR", BASE_DIR / "data"))
 PRODUCTS_ID_FILE = DATA_DIR / "products_ids.json"
+PRODUCTS_ID_STORE = DATA_DIR / "products_ids.bin"
 PRODUCTS_FILE = DATA_DIR / "products.jsonl"
+PRODUCTS_DB = DATA_DIR / "products.db"
+PREVIOUS_PRODUCTS_FILE = DATA_DIR / "products.prev.jsonl"
+REFRESHED_PRODUCTS_FILE = DATA_DIR / "products.new.jsonl"
+BASKETS_FILE = DATA_DIR / "baskets.json"
+CARD_CACHE_FILE = DATA_DIR / "cards_cache.db"
+CHECKPOINT_FILE = DATA_DIR / "checkpoint.json"
+METRICS_FILE = DATA_DIR / "metrics"
+PROFILE_FILE = DATA_DIR / "profile.folded"
+TRACE_FILE = DATA_DIR / "trace.jsonl"
+SHARDS_DIR = DATA_DIR / "shards"
+TASK_QUEUE_DB = DATA_DIR / "tasks.db"
+WORKERS_DIR = DATA_DIR / "workers"
 REPORT_FILE = DATA_DIR
 
 LOGS_DIR = BASE_DIR / "logs"
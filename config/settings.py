@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -29,9 +31,104 @@ class Settings(BaseSettings):
     # BROWSER SETTINGS
     HEADLESS_MODE: bool
     BROWSER_TIMEOUT: int
+    BROWSER_CONTEXTS: int = 1
+    BROWSER_PAGES: int = 4
+    BROWSER_PAGE_MAX_NAVIGATIONS: int = 200
+    BROWSER_RECYCLE_NAVIGATIONS: int = 2000
+    BROWSER_MAX_RSS_MB: int = 2048
+    BROWSER_RSS_CHECK_EVERY: int = 50
+    BROWSER_MAX_RESTARTS: int = 3
+    BLOCK_RESOURCES: bool = True
+    BLOCKED_RESOURCE_TYPES: list[str] = ["image", "media", "font", "stylesheet", "manifest"]
+    BLOCKED_URL_PATTERNS: list[str] = [
+        r"google-analytics\.com",
+        r"googletagmanager\.com",
+        r"doubleclick\.net",
+        r"mc\.yandex\.",
+        r"an\.yandex\.",
+        r"top-fwz1\.mail\.ru",
+        r"vk\.com/rtrg",
+        r"criteo\.",
+        r"adfox\.",
+        r"/analytics/",
+        r"/banners?/",
+    ]
+    ALLOWED_URL_PATTERNS: list[str] = [r"card\.json"]
 
     # REQUESTS SETTINGS
     REQUEST_TIMEOUT: int
+    CARD_DIRECT_HTTP: bool = True
+    CARD_CACHE: bool = True
+    CARD_CACHE_TTL: int = 7 * 24 * 3600
+    CARD_CACHE_MAX_MB: int = 512
+    CARD_CACHE_EVICT_EVERY: int = 500
+    SEARCH_CONCURRENCY: int = 4
+    SEARCH_MAX_PAGES: int = 100
+    SEARCH_SPLIT_BY_PRICE: bool = False
+    SEARCH_PRICE_MIN: int = 0
+    SEARCH_PRICE_MAX: int = 10_000_000
+    SEARCH_SLICE_CONCURRENCY: int = 2
+    DETAILS_BATCH_SIZE: int = 100
+    DETAILS_CONCURRENCY: int = 4
+    HTTP_LIMIT: int = 100
+    HTTP_LIMIT_PER_HOST: int = 20
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_DNS_TTL: int = 300
+    JSON_PARSER: Literal["auto", "orjson", "json"] = "auto"
+    TOKEN_EXPIRED_STATUSES: list[int] = [401, 498]
+    TOKEN_EXPIRED_PATTERNS: list[str] = [
+        r"(?i)^\s*<!doctype html", r"(?i)^\s*<html\b", r"(?is)^\s*<.*(?:captcha|x_wbaas_token)"
+    ]
+    TOKEN_EXPIRED_SCAN_BYTES: int = 2048
+    TOKEN_REFRESH_MIN_INTERVAL: float = 30.0
+
+    # RATE LIMITER SETTINGS
+    SEARCH_RATE: float = 5.0
+    DETAILS_RATE: float = 5.0
+    CARD_RATE: float = 2.0
+    CARD_HTTP_RATE: float = 5.0
+    CARD_HTTP_CONCURRENCY: int = 4
+    LIMITER_INCREASE: float = 1.0
+    LIMITER_DECREASE: float = 0.5
+    LIMITER_RATE_STEP: float = 0.05
+    LIMITER_MIN_RATE_FACTOR: float = 0.1
+    LIMITER_MAX_RATE_FACTOR: float = 2.0
+    LIMITER_MAX_CONCURRENCY_FACTOR: float = 2.0
+    LIMITER_COOLDOWN: float = 2.0
+
+    # PIPELINE SETTINGS
+    CARD_WORKERS: int = 0
+    PIPELINE_QUEUE_SIZE: int = 100
+
+    # SHARD SETTINGS
+    SHARD_WORKERS: int = 2
+    SHARD_RETRIES: int = 2
+    SHARD_PROGRESS_INTERVAL: float = 10.0
+
+    # TASK QUEUE SETTINGS
+    TASK_QUEUE: Literal["none", "sqlite", "redis"] = "none"
+    QUEUE_URL: str = "redis://localhost:6379/0"
+    QUEUE_NAME: str = "wbparser"
+    QUEUE_VISIBILITY_TIMEOUT: float = 300.0
+    QUEUE_PREFETCH_PER_WORKER: int = 10
+    QUEUE_MAX_ATTEMPTS: int = 3
+    QUEUE_IDLE_WAIT: float = 5.0
+    QUEUE_WORKER_ID: str = ""
+
+    # WRITER SETTINGS
+    WRITER_FLUSH_RECORDS: int = 100
+    WRITER_FLUSH_INTERVAL: float = 5.0
+    WRITER_FSYNC: Literal["never", "flush", "close"] = "close"
+    SQLITE_STORE: bool = False
+
+    # METRICS SETTINGS
+    METRICS_FORMAT: Literal["none", "json", "prometheus"] = "none"
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_STALL_MS: float = 100.0
+
+    # CHECKPOINT SETTINGS
+    CHECKPOINT_SAVE_EVERY: int = 50
+    RESUME_MAX_ATTEMPTS: int = 3
 
     # BROWSER CONFIG
     BROWSER_ARGS: list = [
@@ -89,6 +186,17 @@ class ReportSettings(BaseSettings):
         "Рейтинг",
         "Количество отзывов",
     ]
+    EXPORT_BATCH_SIZE: int = 10_000
+    REPORT_BATCH_SIZE: int = 1_000
+    PART_FILTER: dict = {
+        "and": [
+            {"field": "rating", "op": ">=", "value": 4.5},
+            {"field": "price", "op": "<=", "value": 10000},
+            {"option": "Страна производства", "op": "==", "value": "Россия"},
+        ]
+    }
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
 settings = Settings()
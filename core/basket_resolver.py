@@ -0,0 +1,55 @@
+import json
+import re
+
+from loguru import logger
+
+from config.paths import BASKETS_FILE, DATA_DIR
+
+CARD_URL_PATTERN = re.compile(
+    r"^(?P<base>https?://[^/]+)/vol(?P<vol>\d+)/part(?P<part>\d+)/(?P<id>\d+)/info/"
+)
+
+
+class BasketResolver:
+    def __init__(self):
+        self.ranges: dict[str, list[int]] = {}
+
+    def load(self) -> None:
+        if not BASKETS_FILE.exists():
+            return
+
+        with open(BASKETS_FILE, "r", encoding="utf-8") as f:
+            try:
+                self.ranges = json.load(f)
+            except json.JSONDecodeError:
+                self.ranges = {}
+
+        logger.info(f"Загружено {len(self.ranges)} basket-хостов")
+
+    def save(self) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(BASKETS_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.ranges, f, ensure_ascii=False, indent=2)
+
+    def learn(self, card_url: str) -> None:
+        match = CARD_URL_PATTERN.match(card_url)
+        if not match:
+            return
+
+        base, vol = match["base"], int(match["vol"])
+        bounds = self.ranges.setdefault(base, [vol, vol])
+        bounds[0] = min(bounds[0], vol)
+        bounds[1] = max(bounds[1], vol)
+
+    def resolve(self, product_id: int) -> str | None:
+        vol = product_id // 100000
+        for base, (low, high) in self.ranges.items():
+            if low <= vol <= high:
+                return self.card_url(base, product_id)
+        return None
+
+    @staticmethod
+    def card_url(base: str, product_id: int) -> str:
+        vol = product_id // 100000
+        part = product_id // 1000
+        return f"{base}/vol{vol}/part{part}/{product_id}/info/ru/card.json"
@@ -1,10 +1,19 @@
 import asyncio
 import random
 
+import psutil
 from loguru import logger
-from playwright.async_api import async_playwright, Page, Response, Error, TimeoutError
+from playwright.async_api import async_playwright, BrowserContext, Page, Response, Error, TimeoutError
 
 from config.settings import settings
+from core.page_pool import PagePool
+from core.rate_limiter import rate_limiters
+from core.route_filter import RouteFilter
+from utils.fast_json import loads
+from utils.metrics import metrics
+from utils.tracing import add_attempt, add_bytes
+
+BROWSER_CRASHED = object()
 
 
 class BrowserAPI:
@@ -13,31 +22,37 @@ class BrowserAPI:
         self.cookies = cookies
         self.playwright = None
         self.browser = None
-        self.context = None
-        self.page = None
-        self._page_lock = asyncio.Lock()
+        self.contexts: list[BrowserContext] = []
+        self.pool = PagePool()
+        self.route_filter = RouteFilter() if settings.BLOCK_RESOURCES else None
+
+        self._navigations = 0
+        self._stale_contexts = False
+        self._recycle_lock = asyncio.Lock()
 
-    async def open_browser(self) -> Page:
+    async def open_browser(self) -> PagePool:
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=settings.HEADLESS_MODE, args=settings.BROWSER_ARGS
-        )
-        self.context = await self.browser.new_context(**settings.CONTEXT_PARAMS)
-        self.context.set_default_timeout(settings.BROWSER_TIMEOUT)
-        await self.context.add_cookies(self.cookies)
-        await self.context.set_extra_http_headers(self.headers)
-        self.page = await self.context.new_page()
+        await self._launch()
+
+        for _ in range(max(1, settings.BROWSER_CONTEXTS)):
+            self.contexts.append(await self._new_context(self.cookies))
+
+        await self.pool.fill(self.contexts, max(1, settings.BROWSER_PAGES))
 
         logger.info("✅ Браузер Открыт")
 
         logger.debug(self.playwright)
 
-        return self.page
+        return self.pool
 
     async def close_browser(self):
+        await self.pool.close()
+
+        if self.route_filter:
+            self.route_filter.log_stats()
+
         for obj, name in [
-            (self.page, "page"),
-            (self.context, "context"),
+            *[(context, "context") for context in self.contexts],
             (self.browser, "browser"),
         ]:
             if obj:
@@ -55,34 +70,74 @@ class BrowserAPI:
         logger.info("✅ Браузер закрыт")
 
     async def get_product_card(self, product_id: int, retries: int = 3) -> dict | None:
-        async with self._page_lock:
+        for _ in range(settings.BROWSER_MAX_RESTARTS + 1):
+            data = await self._fetch_product_card(product_id, retries)
+            await self._maintain()
+
+            if data is not BROWSER_CRASHED:
+                return data
+
+        logger.error(f"❌ Браузер недоступен, карточка {product_id} не получена")
+        return None
+
+    async def _fetch_product_card(self, product_id: int, retries: int) -> dict | None | object:
+        rate_limiter = rate_limiters["card"]
+
+        async with self.pool.lease() as lease:
+            if lease.navigations >= settings.BROWSER_PAGE_MAX_NAVIGATIONS:
+                await self.pool.renew(lease)
+                if lease.stale:
+                    self._stale_contexts = True
+                    return BROWSER_CRASHED
+
             for attempt in range(retries):
                 try:
-                    async with self.page.expect_response(
-                            lambda r: "card.json" in r.url
-                    ) as response_info:
-                        await self._open_product_page(product_id)
-
-                    response = await response_info.value
-                    data = await response.json()
+                    lease.navigations += 1
+                    self._navigations += 1
+                    add_attempt()
+
+                    async with rate_limiter:
+                        async with lease.page.expect_response(
+                                lambda r: "card.json" in r.url
+                        ) as response_info:
+                            with metrics.timer("browser.navigation"):
+                                await self._open_product_page(lease.page, product_id)
+
+                        with metrics.timer("browser.card_wait"):
+                            response = await response_info.value
+                            body = await response.body()
+                            data = loads(body)
+                        add_bytes(len(body))
+
+                    rate_limiter.success()
                     data["response_url"] = response.url
                     return data
 
                 except TimeoutError as e:
                     wait = random.uniform(3, 7) * (attempt + 1)
                     logger.warning(f"⚠️ Повтор через {wait}с (попытка {attempt + 1}/{retries}): {e}")
-                    await asyncio.sleep(wait)
+                    metrics.inc("browser.timeouts")
+                    with metrics.timer("browser.backoff"):
+                        await asyncio.sleep(wait)
 
                 except Exception as e:
+                    if not self.browser.is_connected():
+                        metrics.inc("browser.crashes")
+                        logger.error(f"❌ Браузер упал при получении карточки {product_id}")
+                        return BROWSER_CRASHED
+
                     if any(err in str(e) for err in ["ERR_CONNECTION_RESET", "ERR_CONNECTION_REFUSED", "chrome-error://"]):
+                        rate_limiter.throttle()
                         wait = random.uniform(10, 20)
                         logger.warning(f"⚠️ Похоже на блокировку, пауза {wait:.1f}с...")
-                        await asyncio.sleep(wait)
+                        metrics.inc("browser.blocks")
+                        with metrics.timer("browser.backoff"):
+                            await asyncio.sleep(wait)
 
-                        try:
-                            await self.page.goto("about:blank", wait_until="domcontentloaded")
-                        except Exception:
-                            pass
+                        await self.pool.heal(lease)
+                        if lease.stale:
+                            self._stale_contexts = True
+                            return BROWSER_CRASHED
 
                         continue
 
@@ -92,7 +147,108 @@ class BrowserAPI:
             logger.error(f"❌ Все {retries} попытки исчерпаны: {product_id}")
             return None
 
-    async def _open_product_page(self, id: int) -> Response:
+    async def live_cookies(self) -> list | None:
+        for context in self.contexts:
+            try:
+                return await context.cookies(settings.SITE_URL)
+            except Error as e:
+                logger.warning(f"⚠️ Не удалось прочитать cookies из браузера: {e.message}")
+        return None
+
+    async def update_cookies(self, cookies: list) -> None:
+        self.cookies = cookies
+        for context in self.contexts:
+            try:
+                await context.add_cookies(cookies)
+            except Error as e:
+                logger.warning(f"⚠️ Не удалось обновить cookies в браузере: {e.message}")
+
+    async def _maintain(self) -> None:
+        if not self.browser.is_connected():
+            await self._recycle(restart=True)
+        elif self._stale_contexts or self._navigations >= settings.BROWSER_RECYCLE_NAVIGATIONS:
+            await self._recycle()
+        elif settings.BROWSER_RSS_CHECK_EVERY > 0 and self._navigations % settings.BROWSER_RSS_CHECK_EVERY == 0:
+            rss = self._rss_mb()
+            if rss >= settings.BROWSER_MAX_RSS_MB:
+                logger.warning(f"⚠️ Память браузера {rss:.0f} МБ, пересоздание контекстов")
+                await self._recycle()
+
+    async def _recycle(self, restart: bool = False) -> None:
+        async with self._recycle_lock:
+            if restart and self.browser.is_connected():
+                return
+            if not restart and not self._stale_contexts and (
+                self._navigations < settings.BROWSER_RECYCLE_NAVIGATIONS
+                and self._rss_mb() < settings.BROWSER_MAX_RSS_MB
+            ):
+                return
+
+            metrics.inc("browser.recycles")
+            leases = await self.pool.drain()
+            jars = await self._live_cookies()
+
+            if restart:
+                logger.warning("⚠️ Перезапуск браузера после сбоя")
+                await self._launch()
+            else:
+                await self.pool.close_pages(leases)
+                for context in self.contexts:
+                    try:
+                        await context.close()
+                    except Error as e:
+                        logger.warning(f"⚠️ Ошибка при закрытии context: {e.message}")
+
+            self.contexts = [await self._new_context(cookies) for cookies in jars]
+            await self.pool.rebuild(leases, self.contexts)
+            self._navigations = 0
+            self._stale_contexts = False
+
+            logger.info(f"✅ Контексты браузера пересозданы ({len(self.contexts)})")
+
+    async def _live_cookies(self) -> list[list]:
+        jars = []
+        for context in self.contexts:
+            try:
+                jars.append(await context.cookies())
+            except Error:
+                jars.append(self.cookies)
+        return jars or [self.cookies]
+
+    async def _launch(self) -> None:
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Error:
+                pass
+
+        self.browser = await self.playwright.chromium.launch(
+            headless=settings.HEADLESS_MODE, args=settings.BROWSER_ARGS
+        )
+
+    async def _new_context(self, cookies: list) -> BrowserContext:
+        context = await self.browser.new_context(**settings.CONTEXT_PARAMS)
+        context.set_default_timeout(settings.BROWSER_TIMEOUT)
+        await context.add_cookies(cookies)
+        await context.set_extra_http_headers(self.headers)
+
+        if self.route_filter:
+            await context.route("**/*", self.route_filter.handle)
+            context.on("response", self.route_filter.on_response)
+
+        return context
+
+    async def _open_product_page(self, page: Page, id: int) -> Response:
         url = settings.SITE_URL + "catalog/" + str(id) + "/detail.aspx"
         logger.debug(f"Используется браузер {self.playwright}")
-        return await self.page.goto(url=url, wait_until="domcontentloaded")
+        return await page.goto(url=url, wait_until="domcontentloaded")
+
+    @staticmethod
+    def _rss_mb() -> float:
+        rss = 0
+        for process in psutil.Process().children(recursive=True):
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss / 1024 / 1024
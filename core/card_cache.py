@@ -0,0 +1,147 @@
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from loguru import logger
+
+from config.paths import CARD_CACHE_FILE, DATA_DIR
+from config.settings import settings
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    product_id INTEGER NOT NULL,
+    dest INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (product_id, dest)
+);
+CREATE INDEX IF NOT EXISTS idx_cards_accessed ON cards (accessed_at);
+"""
+
+
+class CardCache:
+    def __init__(
+        self,
+        path: Path = CARD_CACHE_FILE,
+        ttl: int = settings.CARD_CACHE_TTL,
+        max_bytes: int = settings.CARD_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.connection: sqlite3.Connection | None = None
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0}
+        self._puts_since_check = 0
+
+    def open(self) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        if not self.connection:
+            return
+
+        self._evict()
+        self.connection.close()
+        self.connection = None
+
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0
+        logger.info(
+            f"Кэш карточек: попаданий {self.stats['hits']}, промахов {self.stats['misses']} "
+            f"({hit_rate:.1f}%), устаревших {self.stats['expired']}, "
+            f"сохранено {self.stats['stored']}, вытеснено {self.stats['evicted']}"
+        )
+
+    def get(self, product_id: int, dest: int = settings.DEST) -> dict | None:
+        row = self.connection.execute(
+            "SELECT codec, data, created_at FROM cards WHERE product_id = ? AND dest = ?",
+            (product_id, dest),
+        ).fetchone()
+
+        if not row:
+            self.stats["misses"] += 1
+            return None
+
+        codec, data, created_at = row
+        now = time.time()
+
+        if now - created_at > self.ttl:
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            self.connection.execute(
+                "DELETE FROM cards WHERE product_id = ? AND dest = ?", (product_id, dest)
+            )
+            return None
+
+        self.connection.execute(
+            "UPDATE cards SET accessed_at = ? WHERE product_id = ? AND dest = ?",
+            (now, product_id, dest),
+        )
+        self.stats["hits"] += 1
+        return json.loads(self._decompress(codec, data))
+
+    def put(self, product_id: int, card: dict, dest: int = settings.DEST) -> None:
+        codec, data = self._compress(json.dumps(card, ensure_ascii=False).encode())
+        now = time.time()
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (product_id, dest, codec, data, len(data), now, now),
+        )
+        self.stats["stored"] += 1
+
+        self._puts_since_check += 1
+        if self._puts_since_check >= settings.CARD_CACHE_EVICT_EVERY:
+            self._puts_since_check = 0
+            self._evict()
+
+    def _evict(self) -> None:
+        self.connection.execute("DELETE FROM cards WHERE created_at < ?", (time.time() - self.ttl,))
+
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM cards").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = total - int(self.max_bytes * 0.9)
+        freed, evicted = 0, []
+        for product_id, dest, size in self.connection.execute(
+            "SELECT product_id, dest, size FROM cards ORDER BY accessed_at"
+        ):
+            evicted.append((product_id, dest))
+            freed += size
+            if freed >= target:
+                break
+
+        self.connection.executemany(
+            "DELETE FROM cards WHERE product_id = ? AND dest = ?", evicted
+        )
+        self.stats["evicted"] += len(evicted)
+
+    @staticmethod
+    def _compress(raw: bytes) -> tuple[str, bytes]:
+        if zstd is not None:
+            return "zstd", zstd.compress(raw)
+        return "zlib", zlib.compress(raw)
+
+    @staticmethod
+    def _decompress(codec: str, data: bytes) -> bytes:
+        if codec == "zstd":
+            return zstd.decompress(data)
+        return zlib.decompress(data)
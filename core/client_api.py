@@ -1,36 +1,52 @@
+from itertools import batched
 from pathlib import Path
 
+import asyncio
 import json
 
 from loguru import logger
 from config.paths import COOKIES_FILE
 from config.settings import settings
+from core.basket_resolver import BasketResolver
 from core.browser_api import BrowserAPI
+from core.card_cache import CardCache
 from core.request_api import RequestAPI
+from utils.cookies_fetcher import CookiesManager
 from utils.exceptions import CookiesFileNotFoundError
+from utils.metrics import metrics
 
 
 class ClientAPI:
-    def __init__(self, use_session: bool = False, use_browser: bool = False):
+    def __init__(self, use_session: bool = False, use_browser: bool = False, lazy_browser: bool = False):
         self.use_session = use_session
         self.use_browser = use_browser
+        self.lazy_browser = lazy_browser
 
         self.headers = settings.HEADERS
         self.cookies = self._get_cookies()
 
         self.request_api = None
         self.session = None
-        self.browser = None
+        self.browser_api = None
+        self.basket_resolver = BasketResolver()
+        self.card_cache = CardCache() if settings.CARD_CACHE else None
+        self._browser_lock = asyncio.Lock()
+        self._browser_ready = False
 
     async def __aenter__(self):
         if self.use_session:
             self.request_api = RequestAPI(self.headers, self.cookies)
             self.session = await self.request_api.get_session()
+            self.request_api.cookies_provider = self._refresh_cookies
+            self.basket_resolver.load()
 
         if self.use_browser:
-            pass
             self.browser_api = BrowserAPI(self.headers, self.cookies)
-            self.page = await self.browser_api.open_browser()
+            if not self.lazy_browser:
+                await self._open_browser()
+
+        if self.card_cache:
+            self.card_cache.open()
 
         logger.info("✅ WB Client Инициализирован")
         logger.debug(self)
@@ -39,37 +55,78 @@ class ClientAPI:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.use_session and self.request_api:
             await self.request_api.close_session()
+            self.basket_resolver.save()
 
-        if self.use_browser:
+        if self.browser_api and self.browser_api.playwright:
             await self.browser_api.close_browser()
 
+        if self.card_cache:
+            self.card_cache.close()
+
         logger.info("✅ WB Client Закрыт")
         return False
 
-    async def get_products_list(self, page_number: int) -> list:
+    @property
+    def card_concurrency(self) -> int:
+        return max(1, settings.BROWSER_PAGES) if self.browser_api else 1
+
+    async def get_search_page(self, page_number: int, extra_params: dict | None = None) -> dict:
         url = settings.SEARCH_API_URL
         params = settings.SEARCH_PARAMS.copy()
+        params.update(extra_params or {})
         params["page"] = page_number
 
         data = await self.request_api.make_request(url, params)
 
-        return (data or {}).get("products", [])
-
-    async def get_product(self, product_id: int) -> dict:
-        url = settings.DETAILS_API_URL
-        params = dict()
-        params["dest"] = settings.DEST
-        params["nm"] = product_id
-
-        data = await self.request_api.make_request(url, params)
-
-        products = (data or {}).get("products", [])
-        return products[0] if products else None
-
-    async def get_product_card(self, product_id: int) -> dict | None:
-        data = await self.browser_api.get_product_card(product_id)
+        return data or {}
+
+    async def get_products(self, product_ids: list[int]) -> dict[int, dict]:
+        semaphore = asyncio.Semaphore(settings.DETAILS_CONCURRENCY)
+
+        async def fetch_batch(batch: tuple[int, ...]) -> list[dict]:
+            params = dict()
+            params["dest"] = settings.DEST
+            params["nm"] = ";".join(str(product_id) for product_id in batch)
+
+            async with semaphore:
+                data = await self.request_api.make_request(
+                    settings.DETAILS_API_URL, params, limiter="details"
+                )
+
+            return (data or {}).get("products", [])
+
+        results = await asyncio.gather(
+            *(fetch_batch(batch) for batch in batched(product_ids, settings.DETAILS_BATCH_SIZE))
+        )
+
+        return {
+            product["id"]: product
+            for products in results
+            for product in products
+            if "id" in product
+        }
+
+    async def get_product_card(self, product_id: int, use_cache: bool = True) -> dict | None:
+        if use_cache and self.card_cache:
+            card_data = self.card_cache.get(product_id)
+            if card_data:
+                metrics.inc("card.cache_hit")
+                return card_data
+
+        data = await self._get_card_direct(product_id)
+        if data:
+            metrics.inc("card.direct")
+
+        if not data and self.browser_api:
+            await self._open_browser()
+            with metrics.timer("browser.card"):
+                data = await self.browser_api.get_product_card(product_id)
+            if data:
+                metrics.inc("card.browser")
+                self.basket_resolver.learn(data.get("response_url", ""))
 
         if not data:
+            metrics.inc("card.failed")
             return None
 
         card_data = dict()
@@ -78,8 +135,57 @@ class ClientAPI:
         card_data["options"] = data.get("options", [])
         card_data["description"] = data.get("description", "")
 
+        if self.card_cache:
+            self.card_cache.put(product_id, card_data)
+
         return card_data
 
+    async def _get_card_direct(self, product_id: int) -> dict | None:
+        if not settings.CARD_DIRECT_HTTP or not self.request_api:
+            return None
+
+        url = self.basket_resolver.resolve(product_id)
+        if not url:
+            return None
+
+        data = await self.request_api.make_request(url, limiter="card_http")
+        if not data:
+            logger.debug(f"card.json {product_id} не получен напрямую, переход на браузер")
+            return None
+
+        data["response_url"] = url
+        return data
+
+    async def _open_browser(self) -> None:
+        if self._browser_ready:
+            return
+
+        async with self._browser_lock:
+            if not self._browser_ready:
+                await self.browser_api.open_browser()
+                self._browser_ready = True
+
+    async def _refresh_cookies(self) -> list | None:
+        token = CookiesManager.get_token(self.cookies)
+
+        if self.browser_api:
+            cookies = await self.browser_api.live_cookies()
+            if CookiesManager.get_token(cookies) not in (None, token):
+                logger.info("✅ Cookies взяты из открытого браузера")
+                CookiesManager.save_cookies(cookies)
+                self.cookies = cookies
+                return cookies
+
+        cookies = await CookiesManager.refresh_cookies()
+        if not cookies:
+            return None
+
+        if self.browser_api:
+            await self.browser_api.update_cookies(cookies)
+
+        self.cookies = cookies
+        return cookies
+
     @staticmethod
     def _get_cookies() -> dict:
         if not Path(COOKIES_FILE).exists():
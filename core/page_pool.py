@@ -0,0 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Page, Error
+
+
+class PageLease:
+    def __init__(self, page: Page, context: BrowserContext):
+        self.page = page
+        self.context = context
+        self.navigations = 0
+        self.stale = False
+
+
+class PagePool:
+    def __init__(self):
+        self._idle: asyncio.Queue[PageLease] = asyncio.Queue()
+        self._leases: list[PageLease] = []
+
+    @property
+    def size(self) -> int:
+        return len(self._leases)
+
+    async def fill(self, contexts: list[BrowserContext], size: int) -> None:
+        for index in range(size):
+            context = contexts[index % len(contexts)]
+            lease = PageLease(await context.new_page(), context)
+            self._leases.append(lease)
+            self._idle.put_nowait(lease)
+
+        logger.info(f"✅ Пул страниц готов: {size} стр. в {len(contexts)} контекстах")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[PageLease]:
+        lease = await self._idle.get()
+        try:
+            yield lease
+        finally:
+            self._idle.put_nowait(lease)
+
+    async def drain(self) -> list[PageLease]:
+        return [await self._idle.get() for _ in range(self.size)]
+
+    async def rebuild(self, leases: list[PageLease], contexts: list[BrowserContext]) -> None:
+        for index, lease in enumerate(leases):
+            lease.context = contexts[index % len(contexts)]
+            lease.page = await lease.context.new_page()
+            lease.navigations = 0
+            lease.stale = False
+            self._idle.put_nowait(lease)
+
+    async def renew(self, lease: PageLease) -> None:
+        await self._close_page(lease.page)
+        try:
+            lease.page = await lease.context.new_page()
+        except Error as e:
+            logger.warning(f"⚠️ Не удалось открыть страницу, контекст будет пересоздан: {e.message}")
+            lease.stale = True
+            return
+        lease.navigations = 0
+
+    async def heal(self, lease: PageLease) -> None:
+        try:
+            await lease.page.goto("about:blank", wait_until="domcontentloaded")
+            await lease.page.evaluate("1")
+            return
+        except Error as e:
+            logger.warning(f"⚠️ Страница не прошла проверку, пересоздание: {e.message}")
+
+        await self.renew(lease)
+
+    async def close(self) -> None:
+        await self.close_pages(self._leases)
+        self._leases.clear()
+
+    async def close_pages(self, leases: list[PageLease]) -> None:
+        for lease in leases:
+            await self._close_page(lease.page)
+
+    @staticmethod
+    async def _close_page(page: Page) -> None:
+        try:
+            await page.close()
+        except Error as e:
+            logger.warning(f"⚠️ Ошибка при закрытии page: {e.message}")
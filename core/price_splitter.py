@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import suppress
+from typing import AsyncGenerator
+
+from loguru import logger
+
+from config.settings import settings
+from core.client_api import ClientAPI
+from core.search_paginator import SearchPaginator
+
+MIN_BAND = 100
+
+
+class PriceSplitter:
+    def __init__(self, client: ClientAPI):
+        self.client = client
+        self.cap = settings.SEARCH_MAX_PAGES * settings.LIMIT
+        self.probes = 0
+        self._probe_semaphore = asyncio.Semaphore(settings.SEARCH_SLICE_CONCURRENCY)
+
+    async def slices(self) -> list[tuple[dict, dict]]:
+        slices = await self._split(settings.SEARCH_PRICE_MIN * 100, settings.SEARCH_PRICE_MAX * 100)
+        logger.info(
+            f"Запрос разбит на {len(slices)} ценовых диапазонов за {self.probes} запросов, "
+            f"товаров: {sum(first_page.get('total') or 0 for _, first_page in slices)}"
+        )
+        return slices
+
+    async def pages(self) -> AsyncGenerator[tuple[str, int, list[dict]]]:
+        slices = await self.slices()
+        queue: asyncio.Queue = asyncio.Queue(settings.SEARCH_SLICE_CONCURRENCY * 2)
+        semaphore = asyncio.Semaphore(settings.SEARCH_SLICE_CONCURRENCY)
+
+        async def crawl(params: dict, first_page: dict) -> None:
+            async with semaphore:
+                paginator = SearchPaginator(self.client, params)
+                async for page, products in paginator.pages(first_page=first_page):
+                    await queue.put((params["priceU"], page, products))
+
+        async def crawl_all() -> None:
+            try:
+                await asyncio.gather(*(crawl(params, first_page) for params, first_page in slices))
+            finally:
+                await queue.put(None)
+
+        task = asyncio.create_task(crawl_all())
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+            await task
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def _split(self, low: int, high: int) -> list[tuple[dict, dict]]:
+        params = {"priceU": f"{low};{high}"}
+        async with self._probe_semaphore:
+            first_page = await self.client.get_search_page(settings.START_PAGE, params)
+        self.probes += 1
+
+        if not first_page.get("products"):
+            return []
+
+        total = first_page.get("total") or 0
+        if total <= self.cap:
+            return [(params, first_page)]
+
+        if high - low < MIN_BAND:
+            logger.warning(
+                f"⚠️ Диапазон {low / 100:.2f}–{high / 100:.2f} ₽ не делится дальше: "
+                f"{total} товаров, будет получено не больше {self.cap}"
+            )
+            return [(params, first_page)]
+
+        middle = (low + high) // 2
+        lower, upper = await asyncio.gather(self._split(low, middle), self._split(middle + 1, high))
+        return lower + upper
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from loguru import logger
+
+from config.settings import settings
+
+
+class AdaptiveLimiter:
+    def __init__(self, name: str, rate: float, concurrency: int):
+        self.name = name
+        self.rate = rate
+        self.min_rate = rate * settings.LIMITER_MIN_RATE_FACTOR
+        self.max_rate = rate * settings.LIMITER_MAX_RATE_FACTOR
+        self.concurrency = float(max(1, concurrency))
+        self.max_concurrency = self.concurrency * max(1.0, settings.LIMITER_MAX_CONCURRENCY_FACTOR)
+
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.concurrency))
+            self._in_flight += 1
+
+        try:
+            await self._take_token()
+        except BaseException:
+            await self._release()
+            raise
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._release()
+        return False
+
+    def success(self) -> None:
+        self.concurrency = min(
+            self.max_concurrency, self.concurrency + settings.LIMITER_INCREASE / self.concurrency
+        )
+        self.rate = min(self.max_rate, self.rate + settings.LIMITER_RATE_STEP)
+
+    def throttle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < settings.LIMITER_COOLDOWN:
+            return
+
+        self._last_decrease = now
+        self.concurrency = max(1.0, self.concurrency * settings.LIMITER_DECREASE)
+        self.rate = max(self.min_rate, self.rate * settings.LIMITER_DECREASE)
+
+        logger.warning(
+            f"⚠️ Лимит {self.name} снижен: {self.rate:.2f} запр/с, "
+            f"параллельно {int(self.concurrency)}"
+        )
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    async def _take_token(self) -> None:
+        async with self._token_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimiters:
+    def __init__(self):
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+
+    def __getitem__(self, name: str) -> AdaptiveLimiter:
+        if name not in self._limiters:
+            rate, concurrency = self._limits()[name]
+            self._limiters[name] = AdaptiveLimiter(name, rate, concurrency)
+        return self._limiters[name]
+
+    @staticmethod
+    def _limits() -> dict[str, tuple[float, int]]:
+        return {
+            "search": (settings.SEARCH_RATE, settings.SEARCH_CONCURRENCY),
+            "details": (settings.DETAILS_RATE, settings.DETAILS_CONCURRENCY),
+            "card": (settings.CARD_RATE, settings.CARD_WORKERS or settings.BROWSER_PAGES),
+            "card_http": (settings.CARD_HTTP_RATE, settings.CARD_HTTP_CONCURRENCY),
+        }
+
+
+rate_limiters = RateLimiters()
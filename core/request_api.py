@@ -1,9 +1,16 @@
 import asyncio
-import json
+import re
+import time
+from typing import Awaitable, Callable
 
-from aiohttp import ClientTimeout, ClientSession, ClientResponseError
+from aiohttp import ClientTimeout, ClientSession, ClientResponseError, TCPConnector
 from loguru import logger
 from config.settings import settings
+from core.rate_limiter import rate_limiters
+from utils.cookies_fetcher import CookiesManager
+from utils.fast_json import loads
+from utils.metrics import metrics
+from utils.tracing import add_attempt, add_bytes
 
 
 class RequestAPI:
@@ -11,13 +18,27 @@ class RequestAPI:
         self.headers = headers
         self.cookies = cookies
         self.session = None
+        self.cookies_provider: Callable[[], Awaitable[list | None]] | None = None
+
+        self._token_lock = asyncio.Lock()
+        self._token_generation = 0
+        self._token_refreshed_at = 0.0
+        self._token_patterns = [re.compile(pattern) for pattern in settings.TOKEN_EXPIRED_PATTERNS]
 
     async def get_session(self) -> ClientSession:
-        for cookie in self.cookies:
-            if cookie.get("name", "") == "x_wbaas_token":
-                self.headers["X-Wbaas-Token"] = cookie["value"]
+        token = CookiesManager.get_token(self.cookies)
+        if token:
+            self.headers["X-Wbaas-Token"] = token
+
+        connector = TCPConnector(
+            limit=settings.HTTP_LIMIT,
+            limit_per_host=settings.HTTP_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=settings.HTTP_DNS_TTL,
+        )
 
         self.session = ClientSession(
+            connector=connector,
             headers=self.headers,
             raise_for_status=True,
             timeout=ClientTimeout(settings.REQUEST_TIMEOUT),
@@ -32,24 +53,92 @@ class RequestAPI:
         await self.session.close()
         logger.info("✅ HTTP Сессия Закрыта")
 
-    async def make_request(self, url: str, params: dict | None = None, retries: int = 3) -> dict | None:
+    async def make_request(
+        self,
+        url: str,
+        params: dict | None = None,
+        retries: int = 3,
+        limiter: str = "search",
+    ) -> dict | None:
+        rate_limiter = rate_limiters[limiter]
+
         for attempt in range(retries):
+            generation = self._token_generation
+            add_attempt()
             try:
-                logger.debug(f"Используется сессия {self.session}")
-                response = await self.session.get(url=url, params=params)
-                response.raise_for_status()
-                return json.loads(await response.text())
+                async with rate_limiter:
+                    with metrics.timer(f"request.{limiter}"):
+                        async with self.session.get(url=url, params=params) as response:
+                            body = await response.read()
+                            content_type = response.content_type
+                            encoding = response.get_encoding()
+                add_bytes(len(body))
+
+                if "json" not in content_type and self._is_token_expired(body):
+                    logger.warning(f"⚠️ Ответ похож на истёкший токен: {url}")
+                    if await self.refresh_token(generation):
+                        continue
+                    return None
+
+                data = loads(body, encoding)
+                rate_limiter.success()
+                return data
             except ClientResponseError as e:
-                if e.status == 429:
+                metrics.inc(f"request.{limiter}.http_{e.status}")
+                if e.status in settings.TOKEN_EXPIRED_STATUSES:
+                    logger.warning(f"⚠️ HTTP {e.status}, похоже истёк x_wbaas_token: {url}")
+                    if await self.refresh_token(generation):
+                        continue
+                    return None
+                elif e.status == 429:
+                    rate_limiter.throttle()
                     wait = 2 ** attempt
                     logger.warning(f"⚠️ 429 Too Many Requests. Повтор через {wait}с (попытка {attempt + 1}/{retries})")
-                    await asyncio.sleep(wait)
+                    with metrics.timer(f"request.{limiter}.backoff"):
+                        await asyncio.sleep(wait)
                 else:
                     logger.error(f"❌ HTTP ошибка {e.status}: {url}")
                     return None
             except Exception as e:
+                metrics.inc(f"request.{limiter}.errors")
                 logger.error(f"❌ Неожиданная ошибка запроса: {e}")
                 return None
 
         logger.error(f"❌ Все {retries} попытки исчерпаны: {url}")
         return None
+
+    async def refresh_token(self, generation: int) -> bool:
+        async with self._token_lock:
+            if generation != self._token_generation:
+                return True
+
+            if time.monotonic() - self._token_refreshed_at < settings.TOKEN_REFRESH_MIN_INTERVAL:
+                return False
+
+            self._token_refreshed_at = time.monotonic()
+
+            if not self.cookies_provider:
+                return False
+
+            logger.info("Обновление cookies и x_wbaas_token...")
+            with metrics.timer("token.refresh"):
+                cookies = await self.cookies_provider()
+            token = CookiesManager.get_token(cookies)
+
+            if not token:
+                logger.error("❌ Не удалось обновить x_wbaas_token")
+                return False
+
+            self._apply_cookies(cookies, token)
+            logger.info("✅ x_wbaas_token обновлён")
+            return True
+
+    def _apply_cookies(self, cookies: list, token: str) -> None:
+        self.cookies = cookies
+        self.headers["X-Wbaas-Token"] = token
+        self.session.headers["X-Wbaas-Token"] = token
+        self._token_generation += 1
+
+    def _is_token_expired(self, body: bytes) -> bool:
+        head = body[:settings.TOKEN_EXPIRED_SCAN_BYTES].decode("utf-8", "ignore")
+        return any(pattern.search(head) for pattern in self._token_patterns)
@@ -0,0 +1,65 @@
+import re
+from collections import Counter
+
+from loguru import logger
+from playwright.async_api import Error, Response, Route
+
+from config.settings import settings
+
+
+class RouteFilter:
+    def __init__(
+        self,
+        blocked_types: list[str] = settings.BLOCKED_RESOURCE_TYPES,
+        blocked_patterns: list[str] = settings.BLOCKED_URL_PATTERNS,
+        allowed_patterns: list[str] = settings.ALLOWED_URL_PATTERNS,
+    ):
+        self.blocked_types = set(blocked_types)
+        self.blocked_pattern = self._compile(blocked_patterns)
+        self.allowed_pattern = self._compile(allowed_patterns)
+
+        self.blocked: Counter[str] = Counter()
+        self.allowed: Counter[str] = Counter()
+        self.loaded_bytes = 0
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+
+        try:
+            if self._should_block(request.url, request.resource_type):
+                self.blocked[request.resource_type] += 1
+                await route.abort("blockedbyclient")
+            else:
+                self.allowed[request.resource_type] += 1
+                await route.continue_()
+        except Error:
+            pass
+
+    def on_response(self, response: Response) -> None:
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            self.loaded_bytes += int(content_length)
+
+    def log_stats(self) -> None:
+        if not self.blocked and not self.allowed:
+            return
+
+        blocked = ", ".join(f"{kind}: {count}" for kind, count in self.blocked.most_common())
+        logger.info(
+            f"Фильтр запросов браузера: заблокировано {self.blocked.total()} "
+            f"({blocked or 'нет'}), пропущено {self.allowed.total()}, "
+            f"загружено ~{self.loaded_bytes / 1024 / 1024:.1f} МБ"
+        )
+
+    def _should_block(self, url: str, resource_type: str) -> bool:
+        if self.allowed_pattern and self.allowed_pattern.search(url):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return bool(self.blocked_pattern and self.blocked_pattern.search(url))
+
+    @staticmethod
+    def _compile(patterns: list[str]) -> re.Pattern | None:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
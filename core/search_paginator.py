@@ -0,0 +1,66 @@
+import asyncio
+import math
+from collections import deque
+from typing import AsyncGenerator
+
+from loguru import logger
+
+from config.settings import settings
+from core.client_api import ClientAPI
+
+
+class SearchPaginator:
+    def __init__(self, client: ClientAPI, extra_params: dict | None = None):
+        self.client = client
+        self.extra_params = extra_params
+        self.total: int | None = None
+
+    async def pages(
+        self, start_page: int = settings.START_PAGE, first_page: dict | None = None
+    ) -> AsyncGenerator[tuple[int, list[dict]]]:
+        if first_page is None:
+            first_page = await self.client.get_search_page(start_page, self.extra_params)
+        products = first_page.get("products", [])
+        if not products:
+            return
+
+        yield start_page, products
+
+        self.total = first_page.get("total")
+        if self.total:
+            last_page = min(math.ceil(self.total / settings.LIMIT), settings.SEARCH_MAX_PAGES)
+            logger.info(f"Найдено {self.total} товаров, страниц: {last_page}")
+            pages = iter(range(start_page + 1, last_page + 1))
+        else:
+            logger.info("Количество товаров неизвестно, страницы запрашиваются до пустой")
+            pages = iter(range(start_page + 1, 2**31))
+
+        async for page in self._ordered_pages(pages):
+            yield page
+
+    async def _ordered_pages(self, pages) -> AsyncGenerator[tuple[int, list[dict]]]:
+        window: deque[tuple[int, asyncio.Task]] = deque()
+
+        def schedule() -> None:
+            page_number = next(pages, None)
+            if page_number is not None:
+                task = asyncio.create_task(
+                    self.client.get_search_page(page_number, self.extra_params)
+                )
+                window.append((page_number, task))
+
+        for _ in range(max(1, settings.SEARCH_CONCURRENCY)):
+            schedule()
+
+        try:
+            while window:
+                page_number, task = window.popleft()
+                products = (await task).get("products", [])
+                if not products:
+                    return
+
+                schedule()
+                yield page_number, products
+        finally:
+            for _, task in window:
+                task.cancel()
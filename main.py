@@ -1,17 +1,28 @@
 import asyncio
 import argparse
+import sys
 
 from asyncio import CancelledError
 
 from loguru import logger
 
+from config.settings import settings
 from core.client_api import ClientAPI
 from collectors.data_collector import DataProductCollector
 from collectors.id_collector import IdProductCollector
+from collectors.queue_worker import QueueWorkerCollector
+from collectors.refresh_collector import RefreshProductCollector
+from collectors.shard_coordinator import ShardCoordinator
+from utils.checkpoint import Checkpoint
+from utils.columnar_exporter import ColumnarExporter
 from utils.cookies_fetcher import CookiesManager
 from utils.exceptions import ParserException
+from utils.filters import RecordFilter
 from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.profiler import SamplingProfiler
 from utils.report_manager import ReportManager
+from utils.tracing import tracer
 
 
 async def main():
@@ -30,24 +41,94 @@ async def main():
     Парсинг товаров (не из файла):
     uv run python -m main --mode data
     
+    Обновление цен и остатков по ранее собранным товарам:
+    uv run python -m main --mode refresh
+    
     Сформировать XLSX-файл из данных парсера:
     uv run python -m main --mode report
     
+    Экспорт данных парсера в Parquet / Arrow IPC:
+    uv run python -m main --mode export --format parquet
+    
     Получение Cookies:
     uv run python -m main --mode cookies
+    
+    Продолжить прерванный сбор (ids/data/full):
+    uv run python -m main --mode full --resume
+    
+    Параллельный сбор по нескольким запросам и регионам в отдельных процессах:
+    uv run python -m main --mode shard --queries "пальто;куртка" --dests "-1185367,-1257786"
+    
+    Параллельный парсинг собранных ID, разбитых на 4 шарда:
+    uv run python -m main --mode shard --split-ids 4
+    
+    Профилирование (data/profile.folded + data/trace.jsonl):
+    uv run python -m main --mode full --profile
         """,
     )
 
     parser.add_argument(
         "--mode",
-        choices=["ids", "data", "full", "report", "cookies"],
+        choices=["ids", "data", "full", "refresh", "shard", "report", "export", "cookies"],
         default="data",
         help="Режим работы парсера",
     )
 
     parser.add_argument(
         "--report-name",
-        help="Название файла отчета (только для --mode report)"
+        help="Название файла отчета (для --mode report и --mode export)"
+    )
+
+    parser.add_argument(
+        "--filter",
+        help="JSON-фильтр для отчета _part (только для --mode report), по умолчанию PART_FILTER"
+    )
+
+    parser.add_argument(
+        "--from-db",
+        action="store_true",
+        help="Строить отчет по products.db (все запуски с SQLITE_STORE=True) вместо products.jsonl"
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["parquet", "arrow"],
+        default="parquet",
+        help="Формат экспорта (только для --mode export)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Продолжить прерванный сбор с последнего чекпоинта (ids/data/full)"
+    )
+
+    parser.add_argument(
+        "--from-file",
+        action="store_true",
+        help="Парсить товары по ID из файла (только для --mode data)"
+    )
+
+    parser.add_argument(
+        "--queries",
+        help="Поисковые запросы через ';' (для --mode shard, по умолчанию SEARCH_QUERY)"
+    )
+
+    parser.add_argument(
+        "--dests",
+        help="Регионы доставки через ',' (для --mode shard, по умолчанию DEST)"
+    )
+
+    parser.add_argument(
+        "--split-ids",
+        type=int,
+        help="Разбить собранные ID на N шардов вместо запросов (для --mode shard)"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Семплирующий профилировщик (profile.folded) и трасса товаров (trace.jsonl)"
     )
 
     args = parser.parse_args()
@@ -55,28 +136,63 @@ async def main():
     if args.mode == "report" and not args.report_name:
         parser.error("--report-name обязателен для --mode report")
 
+    profiler = None
+    if args.profile:
+        tracer.open()
+        profiler = SamplingProfiler()
+        profiler.start()
+
     try:
         if args.mode == "ids":
+            checkpoint = Checkpoint.load(args.resume)
             async with ClientAPI(True, False) as client:
-                id_collector = IdProductCollector(client)
+                id_collector = IdProductCollector(client, checkpoint)
                 await id_collector.collect_ids()
         elif args.mode in {"data", "full"}:
+            use_queue = settings.TASK_QUEUE != "none" and (args.mode == "full" or args.from_file)
+            if args.mode == "data" and use_queue:
+                checkpoint = None
+            else:
+                checkpoint = Checkpoint.load(args.resume)
             async with ClientAPI(True, True) as client:
-                if args.mode == "data":
-                    data_collector = DataProductCollector(client)
+                if args.mode == "full":
+                    id_collector = IdProductCollector(client, checkpoint)
+                    await id_collector.collect_ids()
+
+                if use_queue:
+                    data_collector = QueueWorkerCollector(client)
                     await data_collector.collect_data()
+                elif args.mode == "data":
+                    data_collector = DataProductCollector(client, checkpoint)
+                    await data_collector.collect_data(is_from_file=args.from_file)
                 else:
-                    id_collector = IdProductCollector(client)
-                    await id_collector.collect_ids()
-                    data_collector = DataProductCollector(client)
+                    data_collector = DataProductCollector(client, checkpoint)
                     await data_collector.collect_data(is_from_file=True)
+        elif args.mode == "refresh":
+            async with ClientAPI(True, True, lazy_browser=True) as client:
+                refresh_collector = RefreshProductCollector(client)
+                await refresh_collector.refresh_data()
+        elif args.mode == "shard":
+            if args.split_ids:
+                coordinator = ShardCoordinator.from_ids(args.split_ids)
+            else:
+                queries = args.queries.split(";") if args.queries else [settings.SEARCH_QUERY]
+                dests = args.dests.split(",") if args.dests else [str(settings.DEST)]
+                coordinator = ShardCoordinator.from_queries(queries, dests)
+            await coordinator.run()
         elif args.mode == "report":
-            report_manager = ReportManager(args.report_name)
+            part_filter = RecordFilter.from_json(args.filter) if args.filter else None
+            report_manager = ReportManager(args.report_name, part_filter, args.from_db)
             await report_manager.create_report()
+        elif args.mode == "export":
+            exporter = ColumnarExporter(args.report_name or "products", args.format)
+            await exporter.export()
         else:
             cookies_manager = CookiesManager()
             await cookies_manager.write_cookies()
 
+        return 0
+
     except ParserException as e:
         logger.error(e)
         return 1
@@ -90,8 +206,13 @@ async def main():
         return 1
 
     finally:
+        if profiler:
+            await profiler.stop()
+            tracer.close()
+        metrics.log_summary()
+        metrics.write()
         logger.info("Программа завершила работу")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,79 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from config.settings import settings
+
+
+class BufferedWriter(ABC):
+    name = "writer"
+
+    def __init__(
+        self,
+        flush_records: int = settings.WRITER_FLUSH_RECORDS,
+        flush_interval: float = settings.WRITER_FLUSH_INTERVAL,
+        on_flush: Callable[[list[dict]], Awaitable[None]] | None = None,
+    ):
+        self.flush_records = max(1, flush_records)
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.written = 0
+
+        self._buffer: list[dict] = []
+        self._lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        await asyncio.to_thread(self._open)
+        if self.flush_interval > 0:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._flusher:
+            self._flusher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+
+        try:
+            await self.flush()
+        finally:
+            await asyncio.to_thread(self._close)
+
+        logger.info(f"✅ Записано {self.written} товаров в {self.name}")
+        return False
+
+    async def write(self, record: dict) -> None:
+        self._buffer.append(record)
+        if len(self._buffer) >= self.flush_records:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            chunk, self._buffer = self._buffer, []
+            await asyncio.to_thread(self._write_chunk, chunk)
+            self.written += len(chunk)
+
+            if self.on_flush:
+                await self.on_flush(chunk)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    @abstractmethod
+    def _open(self) -> None: ...
+
+    @abstractmethod
+    def _write_chunk(self, records: list[dict]) -> None: ...
+
+    @abstractmethod
+    def _close(self) -> None: ...
@@ -0,0 +1,88 @@
+import json
+import os
+from pathlib import Path
+
+from loguru import logger
+
+from config.paths import CHECKPOINT_FILE, DATA_DIR
+from config.settings import settings
+
+
+class Checkpoint:
+    def __init__(self, path: Path | None = CHECKPOINT_FILE):
+        self.path = path
+        self.last_page: int | None = None
+        self.ids_done = False
+        self.failed: dict[int, int] = {}
+        self.resumed = False
+        self._changes = 0
+
+    @classmethod
+    def load(cls, resume: bool = False, path: Path = CHECKPOINT_FILE) -> "Checkpoint":
+        checkpoint = cls(path)
+
+        if resume and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    data = {}
+
+            checkpoint.last_page = data.get("last_page")
+            checkpoint.ids_done = data.get("ids_done", False)
+            checkpoint.failed = {int(k): v for k, v in data.get("failed", {}).items()}
+            checkpoint.resumed = True
+
+            logger.info(
+                f"Загружен чекпоинт: страница {checkpoint.last_page}, "
+                f"ошибок {len(checkpoint.failed)}"
+            )
+        else:
+            checkpoint.save()
+
+        return checkpoint
+
+    def mark_page(self, page: int) -> None:
+        self.last_page = page
+        self._changed()
+
+    def mark_ids_done(self) -> None:
+        self.ids_done = True
+        self.save()
+
+    def mark_failed(self, product_id: int) -> None:
+        self.failed[product_id] = self.failed.get(product_id, 0) + 1
+        self._changed()
+
+    def mark_done(self, product_id: int) -> None:
+        if self.failed.pop(product_id, None) is not None:
+            self._changed()
+
+    def can_retry(self, product_id: int) -> bool:
+        return self.failed.get(product_id, 0) < settings.RESUME_MAX_ATTEMPTS
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "last_page": self.last_page,
+                    "ids_done": self.ids_done,
+                    "failed": self.failed,
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+        os.replace(tmp_path, self.path)
+        self._changes = 0
+
+    def _changed(self) -> None:
+        self._changes += 1
+        if self._changes >= settings.CHECKPOINT_SAVE_EVERY:
+            self.save()
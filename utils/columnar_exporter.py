@@ -0,0 +1,145 @@
+import asyncio
+import json
+from typing import Iterator
+
+from loguru import logger
+
+from config.paths import PRODUCTS_FILE, REPORT_FILE
+from config.settings import report_settings
+from utils.exceptions import ExportDependencyNotFoundError
+
+NUMERIC_FIELDS = {
+    "product_id": int,
+    "price": float,
+    "quantity": int,
+    "rating": float,
+    "reviews_count": int,
+}
+STRING_FIELDS = ["link", "title", "description", "seller_link", "sizes"]
+
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrows"}
+
+
+class ColumnarExporter:
+    def __init__(self, export_name: str, export_format: str = "parquet"):
+        self.export_name = export_name
+        self.export_format = export_format
+
+    @property
+    def path(self):
+        return REPORT_FILE / f"{self.export_name}.{EXTENSIONS[self.export_format]}"
+
+    async def export(self) -> None:
+        if not (PRODUCTS_FILE.exists() and PRODUCTS_FILE.stat().st_size > 0):
+            logger.error("❌ Файл с товарами не найден")
+            return
+
+        logger.info(f"Экспорт {PRODUCTS_FILE.name} в {self.path.name}")
+        rows = await asyncio.to_thread(self._export)
+        logger.info(f"✅ Экспорт завершен: {rows} товаров в {self.path.name}")
+
+    def _export(self) -> int:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportDependencyNotFoundError()
+
+        schema = self._schema(pa)
+        rows = 0
+
+        if self.export_format == "parquet":
+            writer = pq.ParquetWriter(self.path, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(
+                self.path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+            )
+
+        with writer:
+            for records in self._batches():
+                writer.write_batch(self._record_batch(pa, schema, records))
+                rows += len(records)
+
+        return rows
+
+    @staticmethod
+    def _schema(pa):
+        option = pa.struct([("name", pa.string()), ("value", pa.string())])
+        return pa.schema(
+            [
+                ("link", pa.string()),
+                ("product_id", pa.int64()),
+                ("title", pa.string()),
+                ("price", pa.float64()),
+                ("description", pa.string()),
+                ("images", pa.list_(pa.string())),
+                ("options", pa.list_(option)),
+                ("seller_name", pa.dictionary(pa.int32(), pa.string())),
+                ("seller_link", pa.string()),
+                ("sizes", pa.string()),
+                ("quantity", pa.int64()),
+                ("rating", pa.float64()),
+                ("reviews_count", pa.int64()),
+            ]
+        )
+
+    def _record_batch(self, pa, schema, records: list[dict]):
+        arrays = {}
+
+        for field in STRING_FIELDS:
+            arrays[field] = [self._string(record.get(field)) for record in records]
+        for field, cast in NUMERIC_FIELDS.items():
+            arrays[field] = [self._number(record.get(field), cast) for record in records]
+
+        arrays["images"] = [record.get("images") or [] for record in records]
+        arrays["options"] = [self._options(record.get("options")) for record in records]
+
+        sellers = [self._string(record.get("seller_name")) for record in records]
+
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(sellers, pa.string()).dictionary_encode()
+                if field.name == "seller_name"
+                else pa.array(arrays[field.name], field.type)
+                for field in schema
+            ],
+            schema=schema,
+        )
+
+    @staticmethod
+    def _batches() -> Iterator[list[dict]]:
+        batch = []
+        with open(PRODUCTS_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                batch.append(json.loads(line))
+                if len(batch) >= report_settings.EXPORT_BATCH_SIZE:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _string(value) -> str | None:
+        if value is None or value == "NO_DATA":
+            return None
+        return str(value)
+
+    @staticmethod
+    def _number(value, cast) -> int | float | None:
+        if value is None or value == "NO_DATA" or value == "":
+            return None
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _options(value) -> list[dict] | None:
+        if not isinstance(value, list):
+            return None
+        return [
+            {"name": str(option.get("name")), "value": str(option.get("value"))}
+            for option in value
+            if isinstance(option, dict)
+        ]
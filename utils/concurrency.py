@@ -0,0 +1,15 @@
+from typing import AsyncGenerator, AsyncIterable, TypeVar
+
+T = TypeVar("T")
+
+
+async def chunked(items: AsyncIterable[T], size: int) -> AsyncGenerator[list[T]]:
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
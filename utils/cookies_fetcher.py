@@ -15,6 +15,17 @@ class CookiesManager:
 
     async def write_cookies(self) -> None:
         cookies = await self._get_cookies()
+        self.save_cookies(cookies)
+
+    @classmethod
+    async def refresh_cookies(cls) -> list[Cookie] | None:
+        cookies = await cls._get_cookies()
+        if cookies:
+            cls.save_cookies(cookies)
+        return cookies
+
+    @staticmethod
+    def save_cookies(cookies: list[Cookie] | None) -> None:
         with open(COOKIES_FILE, "w", encoding="utf-8") as f:
             json.dump(cookies, f, indent=4, ensure_ascii=False)
 
@@ -46,6 +57,13 @@ class CookiesManager:
             finally:
                 await browser.close()
 
+    @staticmethod
+    def get_token(cookies: list[Cookie] | None) -> str | None:
+        for cookie in cookies or []:
+            if cookie.get("name", "") == "x_wbaas_token":
+                return cookie["value"]
+        return None
+
     @staticmethod
     def _create_cookies_dir() -> None:
         COOKIES_DIR.mkdir(parents=True, exist_ok=True)
@@ -13,9 +13,29 @@ class ProductsListFileNotFoundError(ParserException):
     detail = "❌ Файл c ID товаров не найден. Работа программы остановлена"
 
 
+class ProductsFileNotFoundError(ParserException):
+    detail = "❌ Файл с товарами не найден. Работа программы остановлена"
+
+
 class ProductsIDsNotFoundError(ParserException):
     detail = "❌ ID товаров не найдены. Работа программы остановлена"
 
 
 class ProductsListIDsNotFoundError(ParserException):
     detail = "❌ Лист с ID для парсинга не найден. Работа программы остановлена"
+
+
+class ExportDependencyNotFoundError(ParserException):
+    detail = "❌ Для экспорта нужен pyarrow: uv sync --extra export"
+
+
+class QueueDependencyNotFoundError(ParserException):
+    detail = "❌ Для очереди в Redis нужен redis: uv sync --extra queue"
+
+
+class FilterSpecError(ParserException):
+    detail = "❌ Некорректный фильтр отчета"
+
+
+class ShardsFailedError(ParserException):
+    detail = "❌ Не все шарды выполнены, собранные данные объединены"
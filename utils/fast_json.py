@@ -0,0 +1,25 @@
+import json
+from typing import Any
+
+from loguru import logger
+
+from config.settings import settings
+
+
+def _orjson_loads():
+    try:
+        import orjson
+    except ImportError:
+        if settings.JSON_PARSER == "orjson":
+            logger.warning("⚠️ orjson не установлен, используется стандартный json")
+        return None
+    return orjson.loads
+
+
+_loads = None if settings.JSON_PARSER == "json" else _orjson_loads()
+
+
+def loads(body: bytes, encoding: str = "utf-8") -> Any:
+    if _loads is not None:
+        return _loads(body)
+    return json.loads(body.decode(encoding))
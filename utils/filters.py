@@ -0,0 +1,191 @@
+import json
+from typing import Callable
+
+import numpy as np
+
+from utils.exceptions import FilterSpecError
+
+NUMERIC_FIELDS = {"product_id", "price", "quantity", "rating", "reviews_count"}
+
+ORDERING = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+EQUALITY = {"==": np.equal, "!=": np.not_equal}
+MEMBERSHIP = {"in", "not_in"}
+
+Predicate = Callable[["ColumnBatch"], np.ndarray]
+
+
+def _to_float(value) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(str(value).replace(",", ".").replace(" ", ""))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ColumnBatch:
+    def __init__(self, records: list[dict], option_names: set[str]):
+        self.records = records
+        self.size = len(records)
+        self.options = self._index_options(option_names)
+        self._columns: dict[str, np.ndarray] = {}
+
+    def column(self, field: str) -> np.ndarray:
+        if field not in self._columns:
+            values = [record.get(field) for record in self.records]
+            if field in NUMERIC_FIELDS:
+                self._columns[field] = np.array([_to_float(v) for v in values], np.float64)
+            else:
+                self._columns[field] = self._objects(values)
+        return self._columns[field]
+
+    def _index_options(self, names: set[str]) -> dict[str, np.ndarray]:
+        index = {name: np.full(self.size, None, dtype=object) for name in names}
+        if not index:
+            return index
+
+        for row, record in enumerate(self.records):
+            options = record.get("options")
+            if not isinstance(options, list):
+                continue
+            for option in options:
+                column = index.get(option.get("name")) if isinstance(option, dict) else None
+                if column is not None and column[row] is None:
+                    column[row] = option.get("value")
+
+        return index
+
+    def _objects(self, values: list) -> np.ndarray:
+        column = np.empty(self.size, dtype=object)
+        column[:] = values
+        return column
+
+
+class RecordFilter:
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.option_names: set[str] = set()
+        self._predicate = self._compile(spec)
+
+    @classmethod
+    def from_json(cls, text: str) -> "RecordFilter":
+        try:
+            return cls(json.loads(text))
+        except json.JSONDecodeError as e:
+            raise FilterSpecError(e.msg)
+
+    def mask(self, records: list[dict]) -> np.ndarray:
+        if not records:
+            return np.zeros(0, dtype=bool)
+        return self._predicate(ColumnBatch(records, self.option_names))
+
+    def _compile(self, spec: dict) -> Predicate:
+        if not isinstance(spec, dict):
+            raise FilterSpecError(str(spec))
+
+        if "and" in spec:
+            parts = [self._compile(part) for part in spec["and"]]
+
+            def all_of(batch: ColumnBatch) -> np.ndarray:
+                mask = np.ones(batch.size, dtype=bool)
+                for part in parts:
+                    mask &= part(batch)
+                return mask
+
+            return all_of
+
+        if "or" in spec:
+            parts = [self._compile(part) for part in spec["or"]]
+
+            def any_of(batch: ColumnBatch) -> np.ndarray:
+                mask = np.zeros(batch.size, dtype=bool)
+                for part in parts:
+                    mask |= part(batch)
+                return mask
+
+            return any_of
+
+        if "not" in spec:
+            part = self._compile(spec["not"])
+            return lambda batch: ~part(batch)
+
+        if "option" in spec:
+            name = spec["option"]
+            self.option_names.add(name)
+            if spec.get("op") == "exists":
+                return lambda batch: np.not_equal(batch.options[name], None).astype(bool)
+            return self._comparison(lambda batch: batch.options[name], spec)
+
+        if "field" in spec:
+            field = spec["field"]
+            return self._comparison(lambda batch: batch.column(field), spec, field in NUMERIC_FIELDS)
+
+        raise FilterSpecError(json.dumps(spec, ensure_ascii=False))
+
+    @staticmethod
+    def _comparison(
+        column: Callable[["ColumnBatch"], np.ndarray], spec: dict, numeric: bool = False
+    ) -> Predicate:
+        op, value = spec.get("op", "=="), spec.get("value")
+
+        if op in ORDERING:
+            compare, target = ORDERING[op], _to_float(value)
+            if np.isnan(target):
+                raise FilterSpecError(f"{op} ожидает число, получено {value!r}")
+
+            def ordered(batch: ColumnBatch) -> np.ndarray:
+                values = column(batch)
+                if values.dtype != np.float64:
+                    values = np.array([_to_float(v) for v in values], np.float64)
+                return compare(values, target)
+
+            return ordered
+
+        if op in EQUALITY:
+            compare = EQUALITY[op]
+            if isinstance(value, (list, dict)):
+                raise FilterSpecError(f"{op} ожидает одно значение, а не {type(value).__name__}")
+
+            if numeric:
+                if value is None:
+                    missing = np.isnan if op == "==" else lambda values: ~np.isnan(values)
+                    return lambda batch: missing(column(batch))
+
+                target = _to_float(value)
+                if np.isnan(target):
+                    raise FilterSpecError(f"{op} для числового поля ожидает число, получено {value!r}")
+                return lambda batch: compare(column(batch), target)
+
+            return lambda batch: compare(column(batch), value).astype(bool)
+
+        if op in MEMBERSHIP:
+            if not isinstance(value, list):
+                raise FilterSpecError(f"{op} ожидает список значений")
+            allowed, unhashable = set(), []
+            for item in value:
+                try:
+                    allowed.add(item)
+                except TypeError:
+                    unhashable.append(item)
+
+            def contains(v) -> bool:
+                try:
+                    if v in allowed:
+                        return True
+                except TypeError:
+                    pass
+                return v in unhashable
+
+            def member(batch: ColumnBatch) -> np.ndarray:
+                values = column(batch)
+                mask = np.fromiter((contains(v) for v in values), dtype=bool, count=len(values))
+                return mask if op == "in" else ~mask
+
+            return member
+
+        raise FilterSpecError(f"Неизвестный оператор {op}")
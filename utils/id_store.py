@@ -0,0 +1,101 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from config.paths import DATA_DIR, PRODUCTS_ID_FILE, PRODUCTS_ID_STORE
+from utils.exceptions import ProductsListFileNotFoundError
+
+ID_FORMAT = struct.Struct("<Q")
+READ_CHUNK = ID_FORMAT.size * 65536
+
+
+class IdStore:
+    def __init__(self, path: Path = PRODUCTS_ID_STORE, legacy_path: Path = PRODUCTS_ID_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._known: set[int] | None = None
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        if self.path.exists():
+            return self.path.stat().st_size // ID_FORMAT.size
+        return sum(1 for _ in self._iter_legacy())
+
+    def reset(self) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "wb"):
+            pass
+
+    def open(self) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() and self.legacy_path.exists():
+            self._migrate_legacy()
+
+        self._known = set(self.iter_ids()) if self.path.exists() else set()
+        self._file = open(self.path, "ab")
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def add(self, ids: Iterable) -> int:
+        new_ids = []
+        for product_id in ids:
+            if not isinstance(product_id, int) or product_id in self._known:
+                continue
+            self._known.add(product_id)
+            new_ids.append(product_id)
+
+        if new_ids:
+            self._file.write(b"".join(ID_FORMAT.pack(product_id) for product_id in new_ids))
+            self._file.flush()
+
+        return len(new_ids)
+
+    def exists(self) -> bool:
+        return self.path.exists() or self.legacy_path.exists()
+
+    def iter_ids(self) -> Iterator[int]:
+        if not self.path.exists():
+            yield from self._iter_legacy()
+            return
+
+        if self.path.stat().st_size < ID_FORMAT.size:
+            return
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm) - len(mm) % ID_FORMAT.size
+            for offset in range(0, size, READ_CHUNK):
+                chunk = mm[offset:min(offset + READ_CHUNK, size)]
+                for (product_id,) in ID_FORMAT.iter_unpack(chunk):
+                    yield product_id
+
+    def _migrate_legacy(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(ID_FORMAT.pack(product_id) for product_id in dict.fromkeys(self._iter_legacy())))
+        os.replace(tmp_path, self.path)
+
+    def _iter_legacy(self) -> Iterator[int]:
+        if not self.legacy_path.exists():
+            raise ProductsListFileNotFoundError()
+
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            try:
+                ids = json.load(f)
+            except json.JSONDecodeError:
+                ids = []
+
+        yield from (product_id for product_id in ids if isinstance(product_id, int))
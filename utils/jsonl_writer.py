@@ -0,0 +1,34 @@
+import json
+import os
+from pathlib import Path
+
+from config.settings import settings
+from utils.buffered_writer import BufferedWriter
+
+
+class JsonlWriter(BufferedWriter):
+    def __init__(self, path: Path, fsync: str = settings.WRITER_FSYNC, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.name = path.name
+        self.fsync = fsync
+        self._file = None
+
+    def _open(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write_chunk(self, records: list[dict]) -> None:
+        self._file.write(
+            "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        )
+        self._file.flush()
+        if self.fsync == "flush":
+            os.fsync(self._file.fileno())
+
+    def _close(self) -> None:
+        try:
+            if self.fsync != "never":
+                os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,152 @@
+import bisect
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from loguru import logger
+
+from config.paths import DATA_DIR, METRICS_FILE
+from config.settings import settings
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PROMETHEUS_PREFIX = "wbparser"
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                low = BUCKETS[index - 1] if index else 0.0
+                high = BUCKETS[index] if index < len(BUCKETS) else self.max
+                value = low + (high - low) * (rank - seen) / count
+                return min(self.max, max(self.min, value))
+            seen += count
+        return self.max
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counters: dict[str, float] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def inc(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def log_summary(self) -> None:
+        if not self.counters and not self.histograms:
+            return
+
+        elapsed = self.elapsed
+        logger.info(f"📊 Метрики за {elapsed:.1f}с")
+        logger.info(f"{'Таймер':<24} {'кол-во':>8} {'в сек':>8} {'p50, мс':>9} {'p99, мс':>9} {'всего, с':>9}")
+        for name, histogram in sorted(self.histograms.items()):
+            logger.info(
+                f"{name:<24} {histogram.count:>8} {histogram.count / elapsed:>8.1f} "
+                f"{histogram.quantile(0.5) * 1000:>9.1f} {histogram.quantile(0.99) * 1000:>9.1f} "
+                f"{histogram.sum:>9.1f}"
+            )
+
+        logger.info(f"{'Счетчик':<24} {'значение':>8} {'в сек':>8}")
+        for name, value in sorted(self.counters.items()):
+            logger.info(f"{name:<24} {value:>8g} {value / elapsed:>8.1f}")
+
+    def write(self, path: Path | None = None) -> Path | None:
+        if settings.METRICS_FORMAT == "none":
+            return None
+
+        if settings.METRICS_FORMAT == "prometheus":
+            path = path or METRICS_FILE.with_suffix(".prom")
+            content = self._to_prometheus()
+        else:
+            path = path or METRICS_FILE.with_suffix(".json")
+            content = json.dumps(self._to_dict(), ensure_ascii=False, indent=2)
+
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+        logger.info(f"Метрики сохранены в {path.name}")
+        return path
+
+    def _to_dict(self) -> dict:
+        return {
+            "elapsed_sec": self.elapsed,
+            "counters": self.counters,
+            "timers": {
+                name: {
+                    "count": histogram.count,
+                    "sum_sec": histogram.sum,
+                    "max_sec": histogram.max,
+                    "p50_sec": histogram.quantile(0.5),
+                    "p99_sec": histogram.quantile(0.99),
+                    "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], histogram.counts)),
+                }
+                for name, histogram in self.histograms.items()
+            },
+        }
+
+    def _to_prometheus(self) -> str:
+        lines = []
+
+        for name, value in sorted(self.counters.items()):
+            metric = self._metric_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+
+        for name, histogram in sorted(self.histograms.items()):
+            metric = self._metric_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+
+            cumulative = 0
+            for bound, count in zip([*map(str, BUCKETS), "+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+
+            lines += [f"{metric}_sum {histogram.sum}", f"{metric}_count {histogram.count}"]
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _metric_name(name: str) -> str:
+        return f"{PROMETHEUS_PREFIX}_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+metrics = Metrics()
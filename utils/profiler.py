@@ -0,0 +1,96 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from loguru import logger
+
+from config.paths import DATA_DIR, PROFILE_FILE
+from config.settings import settings
+from utils.tracing import tracer
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        interval_ms: float = settings.PROFILE_INTERVAL_MS,
+        stall_ms: float = settings.PROFILE_STALL_MS,
+    ):
+        self.interval = interval_ms / 1000
+        self.stall = stall_ms / 1000
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.stalls = 0
+
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._heartbeat = time.monotonic()
+
+    def start(self) -> None:
+        self._heartbeat_task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Профилирование включено: выборка каждые {self.interval * 1000:g} мс")
+
+    async def stop(self, path: Path = PROFILE_FILE) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        logger.info(
+            f"Профиль сохранен в {path.name}: {self.samples} выборок, "
+            f"{len(self.stacks)} стеков, зависаний цикла событий: {self.stalls}"
+        )
+
+    async def _beat(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _sample(self) -> None:
+        stall_stack, stall_lag = None, 0.0
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+
+            stack = self._collapse(frame)
+            self.stacks[stack] += 1
+            self.samples += 1
+
+            lag = time.monotonic() - self._heartbeat - self.interval
+            if lag > self.stall:
+                stall_stack = stall_stack or stack
+                stall_lag = max(stall_lag, lag)
+            elif stall_stack:
+                self._record_stall(stall_stack, stall_lag)
+                stall_stack, stall_lag = None, 0.0
+
+        if stall_stack:
+            self._record_stall(stall_stack, stall_lag)
+
+    def _record_stall(self, stack: str, lag: float) -> None:
+        self.stalls += 1
+        logger.warning(f"⚠️ Цикл событий заблокирован на {lag * 1000:.0f} мс: {stack.rsplit(';', 1)[-1]}")
+        tracer.event("loop_stall", lag_ms=round(lag * 1000, 1), stack=stack)
+
+    @staticmethod
+    def _collapse(frame: FrameType) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
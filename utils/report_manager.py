@@ -4,85 +4,85 @@ from typing import AsyncGenerator
 import aiofiles
 from loguru import logger
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 
-from config.paths import REPORT_FILE, PRODUCTS_FILE
+from config.paths import REPORT_FILE, PRODUCTS_FILE, PRODUCTS_DB
 from config.settings import report_settings
+from utils.concurrency import chunked
+from utils.filters import RecordFilter
+from utils.metrics import metrics
+from utils.sqlite_store import SqliteProductStore
+
+PRICE_COLUMN = 3
 
 
 class ReportManager:
-    def __init__(self, report_name: str):
+    def __init__(self, report_name: str, part_filter: RecordFilter | None = None, from_db: bool = False):
         self.report_name = report_name
+        self.part_filter = part_filter or RecordFilter(report_settings.PART_FILTER)
+        self.from_db = from_db
 
     async def create_report(self):
         if self._check_exists_file_products():
-            await self._create_main_report()
-            await self._create_part_report()
+            with metrics.timer("report.total"):
+                await self._create_reports()
         else:
             logger.error("❌ Файл с товарами не найден")
 
-    async def _create_main_report(self):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = self.report_name
-
-        logger.info(f"Создание отчета {ws.title}")
-
-        self._set_headers(ws, report_settings.HEADERS)
-        await self._write_data(ws)
-        self._set_column_format(ws)
+    async def _create_reports(self):
+        main_wb, main_ws = self._create_workbook(self.report_name)
+        part_wb, part_ws = self._create_workbook(f"{self.report_name}_part")
 
-        wb.save(f"{REPORT_FILE}/{self.report_name}.xlsx")
+        logger.info(f"Создание отчетов {main_ws.title} и {part_ws.title}")
 
-        logger.info(f"Отчет {ws.title} сохранен")
+        await self._write_data(main_ws, part_ws)
 
-    async def _create_part_report(self):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"{self.report_name}_part"
+        with metrics.timer("report.save"):
+            main_wb.save(f"{REPORT_FILE}/{self.report_name}.xlsx")
+        logger.info(f"Отчет {main_ws.title} сохранен")
 
-        logger.info(f"Создание отчета {ws.title}")
+        with metrics.timer("report.save"):
+            part_wb.save(f"{REPORT_FILE}/{self.report_name}_part.xlsx")
+        logger.info(f"Отчет {part_ws.title} сохранен")
 
+    def _create_workbook(self, title: str) -> tuple[Workbook, Worksheet]:
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title)
         self._set_headers(ws, report_settings.HEADERS)
-        await self._write_filtered_data(ws)
-        self._set_column_format(ws)
-
-        wb.save(f"{REPORT_FILE}/{self.report_name}_part.xlsx")
-
-        logger.info(f"Отчет {ws.title} сохранен")
+        return wb, ws
 
     @staticmethod
     def _set_headers(ws: Worksheet, headers: list[str]):
         logger.info("Установка и форматирование заголовков")
-        ws.append(headers)
 
-        for cell in ws[1]:
+        row = []
+        for index, header in enumerate(headers, start=1):
+            ws.column_dimensions[get_column_letter(index)].width = len(header) + 10
+
+            cell = WriteOnlyCell(ws, value=header)
             cell.font = Font(bold=True)
-            ws.column_dimensions[cell.column_letter].width = (
-                len(str(cell.value or "")) + 10
-            )
+            row.append(cell)
 
-    async def _write_data(self, ws: Worksheet):
-        logger.info("Запись данных...")
-        async for data in self._data_generator():
-            ws.append(self._row_from_data(data))
+        ws.append(row)
 
-    async def _write_filtered_data(self, ws: Worksheet):
+    async def _write_data(self, main_ws: Worksheet, part_ws: Worksheet):
         logger.info("Запись данных...")
-        async for data in self._data_generator():
-            if not isinstance(data["options"], list):
-                continue
-            if data["rating"] == "NO_DATA" or data["price"] == "NO_DATA":
-                continue
+        async for records in chunked(self._data_generator(), report_settings.REPORT_BATCH_SIZE):
+            with metrics.timer("report.batch"):
+                mask = self.part_filter.mask(records)
+
+                for data, is_part in zip(records, mask):
+                    row = self._row_from_data(data)
+                    main_ws.append(self._format_row(main_ws, row))
 
-            is_russian = any(
-                opt["name"] == "Страна производства" and opt.get("value") == "Россия"
-                for opt in data["options"]
-            )
+                    if is_part:
+                        part_ws.append(self._format_row(part_ws, row))
 
-            if data["rating"] >= 4.5 and data["price"] <= 10000 and is_russian:
-                ws.append(self._row_from_data(data))
+            metrics.inc("report.rows", len(records))
+            metrics.inc("report.part_rows", int(mask.sum()))
 
     @staticmethod
     def _row_from_data(data: dict) -> list:
@@ -120,16 +120,24 @@ class ReportManager:
         ]
 
     @staticmethod
-    def _set_column_format(ws: Worksheet) -> None:
-        for cell in ws["D"][1:]:
-            cell.number_format = "#,##0.00"
+    def _format_row(ws: Worksheet, row: list) -> list:
+        price = WriteOnlyCell(ws, value=row[PRICE_COLUMN])
+        price.number_format = "#,##0.00"
+        return [*row[:PRICE_COLUMN], price, *row[PRICE_COLUMN + 1:]]
+
+    async def _data_generator(self) -> AsyncGenerator[dict]:
+        if self.from_db:
+            logger.info(f"Чтение товаров из {PRODUCTS_DB.name}")
+            with SqliteProductStore() as store:
+                for data in store.iter_records(report_settings.REPORT_BATCH_SIZE):
+                    yield data
+            return
 
-    @staticmethod
-    async def _data_generator() -> AsyncGenerator[dict]:
         async with aiofiles.open(PRODUCTS_FILE, "r",encoding="utf-8") as f:
             async for line in f:
                 yield json.loads(line)
 
-    @staticmethod
-    def _check_exists_file_products() -> bool:
+    def _check_exists_file_products(self) -> bool:
+        if self.from_db:
+            return PRODUCTS_DB.exists()
         return PRODUCTS_FILE.exists() and PRODUCTS_FILE.stat().st_size > 0
\ No newline at end of file
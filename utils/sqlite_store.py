@@ -0,0 +1,186 @@
+import sqlite3
+import time
+from itertools import batched
+from pathlib import Path
+from typing import Iterator
+
+from loguru import logger
+
+from config.paths import DATA_DIR, PRODUCTS_DB
+from utils.buffered_writer import BufferedWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    product_id INTEGER PRIMARY KEY,
+    link TEXT,
+    title TEXT,
+    price REAL,
+    description TEXT,
+    seller_name TEXT,
+    seller_link TEXT,
+    sizes TEXT,
+    quantity INTEGER,
+    rating REAL,
+    reviews_count INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS product_images (
+    product_id INTEGER NOT NULL REFERENCES products (product_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (product_id, position)
+);
+CREATE TABLE IF NOT EXISTS product_options (
+    product_id INTEGER NOT NULL REFERENCES products (product_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (product_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_products_seller ON products (seller_name);
+CREATE INDEX IF NOT EXISTS idx_products_price ON products (price);
+CREATE INDEX IF NOT EXISTS idx_products_rating ON products (rating);
+CREATE INDEX IF NOT EXISTS idx_options_name_value ON product_options (name, value);
+"""
+
+COLUMNS = [
+    "product_id",
+    "link",
+    "title",
+    "price",
+    "description",
+    "seller_name",
+    "seller_link",
+    "sizes",
+    "quantity",
+    "rating",
+    "reviews_count",
+]
+NULLABLE = {"price", "quantity", "rating", "reviews_count"}
+
+UPSERT_PRODUCT = f"""
+INSERT INTO products ({", ".join(COLUMNS)}, updated_at)
+VALUES ({", ".join("?" for _ in COLUMNS)}, ?)
+ON CONFLICT (product_id) DO UPDATE SET
+{", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])},
+updated_at = excluded.updated_at
+"""
+
+
+class SqliteProductStore:
+    def __init__(self, path: Path = PRODUCTS_DB):
+        self.path = path
+        self.connection: sqlite3.Connection | None = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def open(self) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def upsert_many(self, records: list[dict]) -> None:
+        now = time.time()
+        records = list({record["product_id"]: record for record in records}.values())
+        ids = [(record["product_id"],) for record in records]
+
+        with self.connection:
+            self.connection.executemany(
+                UPSERT_PRODUCT, [(*self._product_row(record), now) for record in records]
+            )
+            self.connection.executemany("DELETE FROM product_images WHERE product_id = ?", ids)
+            self.connection.executemany("DELETE FROM product_options WHERE product_id = ?", ids)
+            self.connection.executemany(
+                "INSERT INTO product_images VALUES (?, ?, ?)",
+                [
+                    (record["product_id"], position, url)
+                    for record in records
+                    for position, url in enumerate(record.get("images") or [])
+                ],
+            )
+            self.connection.executemany(
+                "INSERT INTO product_options VALUES (?, ?, ?, ?)",
+                [
+                    (record["product_id"], position, option.get("name"), option.get("value"))
+                    for record in records
+                    if isinstance(record.get("options"), list)
+                    for position, option in enumerate(record["options"])
+                ],
+            )
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def iter_records(self, batch_size: int = 1000) -> Iterator[dict]:
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM products ORDER BY product_id"
+        )
+
+        while rows := cursor.fetchmany(batch_size):
+            ids = [row[0] for row in rows]
+            images = self._related(
+                "SELECT product_id, url FROM product_images", ids
+            )
+            options = self._related(
+                "SELECT product_id, name, value FROM product_options", ids
+            )
+
+            for row in rows:
+                record = {
+                    column: "NO_DATA" if value is None and column in NULLABLE else value
+                    for column, value in zip(COLUMNS, row)
+                }
+                record["images"] = [url for (url,) in images.get(row[0], [])]
+                record["options"] = [
+                    {"name": name, "value": value} for name, value in options.get(row[0], [])
+                ] or "NO_DATA"
+                yield record
+
+    def _related(self, query: str, ids: list[int]) -> dict[int, list[tuple]]:
+        related: dict[int, list[tuple]] = {}
+        for chunk in batched(ids, 500):
+            placeholders = ", ".join("?" for _ in chunk)
+            for product_id, *values in self.connection.execute(
+                f"{query} WHERE product_id IN ({placeholders}) ORDER BY product_id, position",
+                chunk,
+            ):
+                related.setdefault(product_id, []).append(tuple(values))
+        return related
+
+    @staticmethod
+    def _product_row(record: dict) -> tuple:
+        return tuple(
+            None if column in NULLABLE and record.get(column) == "NO_DATA" else record.get(column)
+            for column in COLUMNS
+        )
+
+
+class SqliteWriter(BufferedWriter):
+    def __init__(self, store: SqliteProductStore | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store or SqliteProductStore()
+        self.name = self.store.path.name
+
+    def _open(self) -> None:
+        self.store.open()
+        logger.info(f"SQLite-хранилище открыто: {self.store.count()} товаров")
+
+    def _write_chunk(self, records: list[dict]) -> None:
+        self.store.upsert_many(records)
+
+    def _close(self) -> None:
+        self.store.close()
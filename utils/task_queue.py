@@ -0,0 +1,262 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from itertools import batched
+from pathlib import Path
+
+from loguru import logger
+
+from config.paths import DATA_DIR, TASK_QUEUE_DB
+from config.settings import settings
+from utils.exceptions import QueueDependencyNotFoundError
+
+PENDING, LEASED, DONE, DEAD = range(4)
+STATE_NAMES = {PENDING: "pending", LEASED: "leased", DONE: "done", DEAD: "dead"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    product_id INTEGER PRIMARY KEY,
+    state INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks (state, lease_until);
+"""
+
+
+class TaskQueue(ABC):
+    name = "queue"
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    @abstractmethod
+    async def open(self) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    async def enqueue(self, ids: list[int]) -> int: ...
+
+    @abstractmethod
+    async def lease(self, count: int, visibility: float = settings.QUEUE_VISIBILITY_TIMEOUT) -> list[int]: ...
+
+    @abstractmethod
+    async def extend(self, ids: list[int], visibility: float = settings.QUEUE_VISIBILITY_TIMEOUT) -> None: ...
+
+    @abstractmethod
+    async def ack(self, ids: list[int]) -> None: ...
+
+    @abstractmethod
+    async def nack(self, ids: list[int]) -> None: ...
+
+    @abstractmethod
+    async def stats(self) -> dict[str, int]: ...
+
+
+class SqliteTaskQueue(TaskQueue):
+    def __init__(self, path: Path = TASK_QUEUE_DB):
+        self.path = path
+        self.name = path.name
+        self.connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    async def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    async def enqueue(self, ids: list[int]) -> int:
+        return await asyncio.to_thread(self._enqueue, ids)
+
+    async def lease(self, count: int, visibility: float = settings.QUEUE_VISIBILITY_TIMEOUT) -> list[int]:
+        return await asyncio.to_thread(self._lease, count, visibility)
+
+    async def extend(self, ids: list[int], visibility: float = settings.QUEUE_VISIBILITY_TIMEOUT) -> None:
+        await asyncio.to_thread(self._update, ids, "lease_until = ?", "state = 1", (time.time() + visibility,))
+
+    async def ack(self, ids: list[int]) -> None:
+        await asyncio.to_thread(self._update, ids, "state = 2, lease_until = NULL", "state != 2")
+
+    async def nack(self, ids: list[int]) -> None:
+        await asyncio.to_thread(self._update, ids, "state = 0, lease_until = NULL", "state = 1")
+
+    async def stats(self) -> dict[str, int]:
+        return await asyncio.to_thread(self._stats)
+
+    def _stats(self) -> dict[str, int]:
+        with self._lock:
+            rows = self.connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        counts = dict.fromkeys(STATE_NAMES.values(), 0)
+        counts.update({STATE_NAMES[state]: count for state, count in rows})
+        return counts
+
+    def _open(self) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=DELETE")
+        self.connection.executescript(SCHEMA)
+
+    def _enqueue(self, ids: list[int]) -> int:
+        with self._lock, self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO tasks (product_id) VALUES (?)", [(product_id,) for product_id in ids]
+            )
+            return self.connection.total_changes - before
+
+    def _lease(self, count: int, visibility: float) -> list[int]:
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.execute("UPDATE tasks SET state = 0 WHERE state = 1 AND lease_until < ?", (now,))
+            self.connection.execute(
+                "UPDATE tasks SET state = 3 WHERE state = 0 AND attempts >= ?", (settings.QUEUE_MAX_ATTEMPTS,)
+            )
+            rows = self.connection.execute(
+                """
+                UPDATE tasks SET state = 1, lease_until = ?, attempts = attempts + 1
+                WHERE product_id IN (SELECT product_id FROM tasks WHERE state = 0 LIMIT ?)
+                RETURNING product_id
+                """,
+                (now + visibility, count),
+            ).fetchall()
+        return [product_id for (product_id,) in rows]
+
+    def _update(self, ids: list[int], assignment: str, condition: str, params: tuple = ()) -> None:
+        with self._lock, self.connection:
+            for chunk in batched(ids, 500):
+                placeholders = ", ".join("?" for _ in chunk)
+                self.connection.execute(
+                    f"UPDATE tasks SET {assignment} WHERE {condition} AND product_id IN ({placeholders})",
+                    (*params, *chunk),
+                )
+
+
+ENQUEUE_SCRIPT = """
+local added = 0
+for _, id in ipairs(ARGV) do
+    if redis.call('SADD', KEYS[1], id) == 1 then
+        redis.call('RPUSH', KEYS[2], id)
+        added = added + 1
+    end
+end
+return added
+"""
+
+LEASE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('RPUSH', KEYS[1], id)
+end
+local leased = {}
+while #leased < tonumber(ARGV[3]) do
+    local id = redis.call('LPOP', KEYS[1])
+    if not id then break end
+    if redis.call('HINCRBY', KEYS[3], id, 1) > tonumber(ARGV[4]) then
+        redis.call('SADD', KEYS[4], id)
+    else
+        redis.call('ZADD', KEYS[2], ARGV[2], id)
+        table.insert(leased, id)
+    end
+end
+return leased
+"""
+
+NACK_SCRIPT = """
+for _, id in ipairs(ARGV) do
+    if redis.call('ZREM', KEYS[2], id) == 1 then
+        redis.call('RPUSH', KEYS[1], id)
+    end
+end
+return 0
+"""
+
+
+class RedisTaskQueue(TaskQueue):
+    def __init__(self, url: str = settings.QUEUE_URL, prefix: str = settings.QUEUE_NAME):
+        self.url = url
+        self.name = prefix
+        self.keys = {key: f"{prefix}:{key}" for key in ("known", "pending", "leased", "attempts", "done", "dead")}
+        self.redis = None
+        self._scripts = {}
+
+    async def open(self) -> None:
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise QueueDependencyNotFoundError()
+
+        self.redis = aioredis.from_url(self.url, decode_responses=True)
+        await self.redis.ping()
+        self._scripts = {
+            "enqueue": self.redis.register_script(ENQUEUE_SCRIPT),
+            "lease": self.redis.register_script(LEASE_SCRIPT),
+            "nack": self.redis.register_script(NACK_SCRIPT),
+        }
+
+    async def close(self) -> None:
+        if self.redis:
+            await self.redis.aclose()
+            self.redis = None
+
+    async def enqueue(self, ids: list[int]) -> int:
+        added = 0
+        for chunk in batched(ids, 1000):
+            added += await self._scripts["enqueue"](keys=[self.keys["known"], self.keys["pending"]], args=chunk)
+        return added
+
+    async def lease(self, count: int, visibility: float = settings.QUEUE_VISIBILITY_TIMEOUT) -> list[int]:
+        now = time.time()
+        ids = await self._scripts["lease"](
+            keys=[self.keys["pending"], self.keys["leased"], self.keys["attempts"], self.keys["dead"]],
+            args=[now, now + visibility, count, settings.QUEUE_MAX_ATTEMPTS],
+        )
+        return [int(product_id) for product_id in ids]
+
+    async def extend(self, ids: list[int], visibility: float = settings.QUEUE_VISIBILITY_TIMEOUT) -> None:
+        if ids:
+            deadline = time.time() + visibility
+            await self.redis.zadd(self.keys["leased"], dict.fromkeys(ids, deadline), xx=True)
+
+    async def ack(self, ids: list[int]) -> None:
+        if not ids:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.keys["leased"], *ids)
+            pipe.sadd(self.keys["done"], *ids)
+            await pipe.execute()
+
+    async def nack(self, ids: list[int]) -> None:
+        if ids:
+            await self._scripts["nack"](keys=[self.keys["pending"], self.keys["leased"]], args=ids)
+
+    async def stats(self) -> dict[str, int]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.llen(self.keys["pending"])
+            pipe.zcard(self.keys["leased"])
+            pipe.scard(self.keys["done"])
+            pipe.scard(self.keys["dead"])
+            pending, leased, done, dead = await pipe.execute()
+        return {"pending": pending, "leased": leased, "done": done, "dead": dead}
+
+
+def create_task_queue() -> TaskQueue | None:
+    if settings.TASK_QUEUE == "sqlite":
+        return SqliteTaskQueue()
+    if settings.TASK_QUEUE == "redis":
+        return RedisTaskQueue()
+
+    logger.debug("Очередь задач отключена")
+    return None
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from loguru import logger
+
+from config.paths import DATA_DIR, TRACE_FILE
+
+
+class ProductTrace:
+    def __init__(self, product_id: int):
+        self.product_id = product_id
+        self.stages: dict[str, list[float]] = {}
+        self.attempts = 0
+        self.bytes = 0
+
+    def to_dict(self, status: str) -> dict:
+        return {
+            "id": self.product_id,
+            "status": status,
+            "stages": self.stages,
+            "attempts": self.attempts,
+            "bytes": self.bytes,
+        }
+
+
+_current: ContextVar[ProductTrace | None] = ContextVar("product_trace", default=None)
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self._traces: dict[int, ProductTrace] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open(self, path: Path = TRACE_FILE) -> None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        self.enabled = True
+
+    def close(self) -> None:
+        if not self._file:
+            return
+
+        for trace in self._traces.values():
+            self._write(trace.to_dict("unfinished"))
+        self._traces.clear()
+
+        self.enabled = False
+        self._file.close()
+        self._file = None
+        logger.info(f"Трасса товаров сохранена в {TRACE_FILE.name}")
+
+    @contextmanager
+    def span(self, product_id: int, stage: str):
+        if not self.enabled:
+            yield
+            return
+
+        trace = self._get(product_id)
+        token = _current.set(trace)
+        started = time.time()
+        try:
+            yield
+        finally:
+            trace.stages[stage] = [round(started, 6), round(time.time(), 6)]
+            _current.reset(token)
+
+    def record(self, product_id: int, stage: str, started: float, ended: float) -> None:
+        if self.enabled:
+            self._get(product_id).stages[stage] = [round(started, 6), round(ended, 6)]
+
+    def finish(self, product_id: int, status: str = "done") -> None:
+        trace = self._traces.pop(product_id, None)
+        if trace:
+            self._write(trace.to_dict(status))
+
+    def _get(self, product_id: int) -> ProductTrace:
+        trace = self._traces.get(product_id)
+        if trace is None:
+            trace = self._traces[product_id] = ProductTrace(product_id)
+        return trace
+
+    def event(self, name: str, **fields) -> None:
+        if self.enabled:
+            self._write({"event": name, "ts": round(time.time(), 6), **fields})
+
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def add_attempt() -> None:
+    trace = _current.get()
+    if trace:
+        trace.attempts += 1
+
+
+def add_bytes(size: int) -> None:
+    trace = _current.get()
+    if trace:
+        trace.bytes += size
+
+
+tracer = Tracer()